@@ -0,0 +1,99 @@
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, HttpUrl
+from typing import Dict, Any, List, Literal, Optional
+import asyncio
+import json
+import os
+
+from services.article_extractor import ArticleExtractor
+from services.fact_checker import FactChecker
+from services.news_searcher import NewsSearcher
+from services.credibility_scorer import CredibilityScorer
+from services.combined_analyzer import CombinedAnalyzer
+from services.heuristic_scorer import HeuristicScorer
+from api.verification import verify_article_handler, URLVerificationRequest
+from utils.helpers import canonicalize_url
+
+BATCH_MAX_URLS = int(os.getenv("BATCH_MAX_URLS", "500"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+
+
+class BatchVerificationRequest(BaseModel):
+    urls: List[HttpUrl]
+    concurrency: Optional[int] = None
+    tier: Literal["fast", "full", "auto"] = "full"
+
+
+def _dedupe_urls(urls: List[str]) -> Dict[str, List[str]]:
+    unique: Dict[str, List[str]] = {}
+    for url in urls:
+        unique.setdefault(canonicalize_url(url), []).append(url)
+    return unique
+
+
+async def verify_batch_handler(
+    request: BatchVerificationRequest,
+    article_extractor: ArticleExtractor,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+    combined_analyzer: Optional[CombinedAnalyzer] = None,
+    heuristic_scorer: Optional[HeuristicScorer] = None,
+) -> StreamingResponse:
+    if not request.urls:
+        raise HTTPException(status_code=400, detail="No URLs provided")
+
+    if len(request.urls) > BATCH_MAX_URLS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many URLs in batch (maximum {BATCH_MAX_URLS})",
+        )
+
+    concurrency = min(
+        request.concurrency or BATCH_MAX_CONCURRENCY, BATCH_MAX_CONCURRENCY
+    )
+    if concurrency < 1:
+        raise HTTPException(status_code=400, detail="Concurrency must be at least 1")
+
+    unique_urls = _dedupe_urls([str(url) for url in request.urls])
+    semaphore = asyncio.Semaphore(concurrency)
+
+    print(
+        f"Verifying batch of {len(unique_urls)} unique URLs "
+        f"({len(request.urls)} submitted, concurrency {concurrency})"
+    )
+
+    async def verify_one(requested_urls: List[str]) -> Dict[str, Any]:
+        url = requested_urls[0]
+        async with semaphore:
+            try:
+                result = await verify_article_handler(
+                    URLVerificationRequest(url=url, tier=request.tier),
+                    article_extractor,
+                    fact_checker,
+                    news_searcher,
+                    credibility_scorer,
+                    combined_analyzer,
+                    heuristic_scorer,
+                )
+            except HTTPException as e:
+                result = {"success": False, "detail": e.detail}
+            except Exception as e:
+                result = {"success": False, "detail": str(e)}
+
+        return {"url": url, "requested_urls": requested_urls, **result}
+
+    async def stream_results():
+        tasks = [
+            asyncio.create_task(verify_one(requested_urls))
+            for requested_urls in unique_urls.values()
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield json.dumps(await next_result, default=str) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
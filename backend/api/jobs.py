@@ -0,0 +1,76 @@
+from fastapi import HTTPException
+from typing import Dict, Any, Optional
+
+from services.article_extractor import ArticleExtractor
+from services.fact_checker import FactChecker
+from services.news_searcher import NewsSearcher
+from services.credibility_scorer import CredibilityScorer
+from services.combined_analyzer import CombinedAnalyzer
+from services.heuristic_scorer import HeuristicScorer
+from api.verification import verify_article_handler, URLVerificationRequest
+from api.search import search_news_handler, NewsSearchRequest
+from utils.jobs import JobManager, JobQueueFull
+
+
+def _accepted(job: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/api/jobs/{job['job_id']}",
+    }
+
+
+async def submit_verify_job_handler(
+    request: URLVerificationRequest,
+    job_manager: JobManager,
+    article_extractor: ArticleExtractor,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+    combined_analyzer: Optional[CombinedAnalyzer] = None,
+    heuristic_scorer: Optional[HeuristicScorer] = None,
+) -> Dict[str, Any]:
+    try:
+        job = await job_manager.submit(
+            "verify",
+            lambda: verify_article_handler(
+                request,
+                article_extractor,
+                fact_checker,
+                news_searcher,
+                credibility_scorer,
+                combined_analyzer,
+                heuristic_scorer,
+            ),
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return _accepted(job)
+
+
+async def submit_search_job_handler(
+    request: NewsSearchRequest,
+    job_manager: JobManager,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+) -> Dict[str, Any]:
+    try:
+        job = await job_manager.submit(
+            "search",
+            lambda: search_news_handler(
+                request, fact_checker, news_searcher, credibility_scorer
+            ),
+        )
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    return _accepted(job)
+
+
+async def get_job_handler(job_id: str, job_manager: JobManager) -> Dict[str, Any]:
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return job
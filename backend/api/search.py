@@ -1,10 +1,15 @@
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
 
 from services.fact_checker import FactChecker
 from services.news_searcher import NewsSearcher
 from services.credibility_scorer import CredibilityScorer
+from utils.helpers import format_sse
+from utils.singleflight import SingleFlight
+
+search_flight = SingleFlight()
 
 
 class NewsSearchRequest(BaseModel):
@@ -17,6 +22,24 @@ async def search_news_handler(
     fact_checker: FactChecker,
     news_searcher: NewsSearcher,
     credibility_scorer: CredibilityScorer,
+) -> Dict[str, Any]:
+    return await search_flight.do(
+        _search_key(request),
+        lambda: _search_news(request, fact_checker, news_searcher, credibility_scorer),
+    )
+
+
+def _search_key(request: NewsSearchRequest) -> str:
+    query = " ".join(request.query.lower().split())
+    sources = ",".join(sorted(s.lower() for s in request.sources or []))
+    return f"{query}|{sources}"
+
+
+async def _search_news(
+    request: NewsSearchRequest,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
 ) -> Dict[str, Any]:
     try:
         query = request.query
@@ -54,3 +77,62 @@ async def search_news_handler(
     except Exception as e:
         print(f"Error in search_news_handler: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def search_news_stream_handler(
+    request: NewsSearchRequest,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+) -> StreamingResponse:
+    query = request.query
+
+    async def stream_events():
+        try:
+            print(f"Searching news for: {query}")
+            search_results = await news_searcher.search_multiple_sources(
+                query=query, sources=request.sources
+            )
+        except Exception as e:
+            print(f"Error in search_news_stream_handler: {str(e)}")
+            yield format_sse("error", {"status_code": 500, "detail": str(e)})
+            return
+
+        articles = search_results.get("articles", []) if search_results else []
+        if not articles:
+            yield format_sse(
+                "complete",
+                {
+                    "success": False,
+                    "message": "No articles found for the given query",
+                },
+            )
+            return
+
+        yield format_sse(
+            "articles",
+            {
+                "query": query,
+                "articles": articles,
+                "bias_analysis": credibility_scorer.analyze_bias_distribution(
+                    articles=articles
+                ),
+                "total_sources": len(articles),
+            },
+        )
+
+        print("Streaming neutral summary...")
+        summary_data = {}
+        async for field, value in fact_checker.stream_neutral_summary(
+            articles=articles, query=query
+        ):
+            summary_data[field] = value
+            yield format_sse("summary", {"field": field, "value": value})
+
+        yield format_sse("complete", {"success": True, "summary": summary_data})
+
+    return StreamingResponse(
+        search_flight.stream(_search_key(request), stream_events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
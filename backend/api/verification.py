@@ -1,72 +1,329 @@
 from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import HttpUrl
-from typing import Dict, Any
+from typing import Dict, Any, Awaitable, Callable, List, Literal, Optional, Tuple
+import asyncio
+import os
 
 from services.article_extractor import ArticleExtractor
-from services.fact_checker import FactChecker
+from services.fact_checker import FactChecker, claims_fallback
 from services.news_searcher import NewsSearcher
 from services.credibility_scorer import CredibilityScorer
+from services.combined_analyzer import CombinedAnalyzer
+from services.heuristic_scorer import HeuristicScorer
+from utils.concurrency import run_blocking
+from utils.helpers import canonicalize_url, format_sse
+from utils.metrics import FALLBACKS, STAGE_DURATION
+from utils.singleflight import SingleFlight
+from utils.tracing import span
 
 
 from pydantic import BaseModel, HttpUrl
 
+STAGE_TIMEOUTS = {
+    "credibility": float(os.getenv("CREDIBILITY_TIMEOUT", "60")),
+    "fact_checks": float(os.getenv("FACT_CHECK_TIMEOUT", "60")),
+    "combined_analysis": float(os.getenv("COMBINED_ANALYSIS_TIMEOUT", "75")),
+    "similar_articles": float(os.getenv("SIMILAR_ARTICLES_TIMEOUT", "20")),
+}
+
+STREAM_EVENTS = {
+    "credibility": "credibility",
+    "fact_checks": "claims",
+    "similar_articles": "similar_articles",
+}
+
+verify_flight = SingleFlight()
+
 
 class URLVerificationRequest(BaseModel):
     url: HttpUrl
+    tier: Literal["fast", "full", "auto"] = "full"
 
 
-async def verify_article_handler(
-    request: URLVerificationRequest,
-    article_extractor: ArticleExtractor,
+async def _run_stage(
+    name: str,
+    coro: Awaitable,
+    fallback: Callable[[str], Any],
+    failed_stages: List[str],
+) -> Any:
+    try:
+        with STAGE_DURATION.time(stage=name), span(f"stage.{name}"):
+            return await asyncio.wait_for(coro, timeout=STAGE_TIMEOUTS[name])
+    except asyncio.TimeoutError:
+        print(f"Stage '{name}' timed out after {STAGE_TIMEOUTS[name]}s")
+        reason = "timeout"
+    except Exception as e:
+        print(f"Stage '{name}' failed: {str(e)}")
+        reason = "error"
+    FALLBACKS.inc(component=name, reason=reason)
+    failed_stages.append(name)
+    return fallback(reason)
+
+
+def _incomplete(analysis: str, reason: str) -> str:
+    if reason == "timeout":
+        return f"{analysis} did not complete in time"
+    return f"{analysis} failed due to an error"
+
+
+def _fact_check_fallback(reason: str) -> Dict[str, Any]:
+    return claims_fallback(_incomplete("Claim analysis", reason))
+
+
+async def _extract_article(
+    url: str, article_extractor: ArticleExtractor
+) -> Dict[str, Any]:
+    print(f"Extracting article from: {url}")
+    with STAGE_DURATION.time(stage="extraction"):
+        article_data = await run_blocking(article_extractor.extract, url)
+
+    if not article_data or not article_data.get("text"):
+        raise HTTPException(status_code=400, detail="Failed to extract article content")
+
+    return article_data
+
+
+def _article_payload(article_data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "title": article_data.get("title", ""),
+        "author": article_data.get("author", ""),
+        "publish_date": article_data.get("publish_date", ""),
+        "summary": article_data.get("summary", ""),
+        "text_preview": article_data.get("text", "")[:500] + "...",
+        "top_image": article_data.get("top_image", ""),
+    }
+
+
+async def _analysis_stages(
+    url: str,
+    article_data: Dict[str, Any],
     fact_checker: FactChecker,
     news_searcher: NewsSearcher,
     credibility_scorer: CredibilityScorer,
-) -> Dict[str, Any]:
-    try:
-        url = str(request.url)
+    combined_analyzer: Optional[CombinedAnalyzer],
+    heuristic_scorer: HeuristicScorer,
+    tier: str,
+    failed_stages: List[str],
+) -> Tuple[str, List[Awaitable[Dict[str, Any]]]]:
+    title = article_data.get("title", "")
+    text = article_data.get("text", "")
+    author = article_data.get("author", "")
+    publish_date = article_data.get("publish_date", "")
+
+    async def similar_articles_stage() -> Dict[str, Any]:
+        similar_articles = await _run_stage(
+            "similar_articles",
+            news_searcher.find_similar(query=title, exclude_domain=url),
+            lambda reason: [],
+            failed_stages,
+        )
+        return {"similar_articles": similar_articles}
 
-        print(f"Extracting article from: {url}")
-        article_data = article_extractor.extract(url)
+    heuristic_result = await heuristic_scorer.analyze_async(
+        url=url, title=title, text=text, author=author, publish_date=publish_date
+    )
 
-        if not article_data or not article_data.get("text"):
-            raise HTTPException(
-                status_code=400, detail="Failed to extract article content"
+    def credibility_fallback(reason: str) -> Dict[str, Any]:
+        return credibility_scorer.fallback_result(
+            heuristic_result, _incomplete("Credibility analysis", reason)
+        )
+
+    if tier == "auto":
+        tier = "fast" if heuristic_scorer.is_confident(heuristic_result) else "full"
+
+    if tier == "fast":
+
+        async def heuristic_stage() -> Dict[str, Any]:
+            return {
+                "credibility": heuristic_result,
+                "fact_checks": heuristic_scorer.fact_check_result(heuristic_result),
+            }
+
+        print("Scoring credibility with local heuristics...")
+        return tier, [heuristic_stage(), similar_articles_stage()]
+
+    if combined_analyzer is not None:
+
+        async def combined_stage() -> Dict[str, Any]:
+            credibility_data, fact_check_results = await _run_stage(
+                "combined_analysis",
+                combined_analyzer.analyze(
+                    url=url,
+                    title=title,
+                    text=text,
+                    author=author,
+                    publish_date=publish_date,
+                    prior=heuristic_result,
+                ),
+                lambda reason: (
+                    credibility_fallback(reason),
+                    _fact_check_fallback(reason),
+                ),
+                failed_stages,
             )
+            return {"credibility": credibility_data, "fact_checks": fact_check_results}
 
-        print("Analyzing credibility...")
-        credibility_data = await credibility_scorer.analyze(
-            url=url,
-            title=article_data.get("title", ""),
-            text=article_data.get("text", ""),
-            author=article_data.get("author", ""),
-            publish_date=article_data.get("publish_date", ""),
+        print("Running combined credibility and claim analysis...")
+        return tier, [combined_stage(), similar_articles_stage()]
+
+    async def credibility_stage() -> Dict[str, Any]:
+        credibility_data = await _run_stage(
+            "credibility",
+            credibility_scorer.analyze(
+                url=url,
+                title=title,
+                text=text,
+                author=author,
+                publish_date=publish_date,
+                prior=heuristic_result,
+            ),
+            credibility_fallback,
+            failed_stages,
         )
+        return {"credibility": credibility_data}
 
-        print("Checking claims...")
-        fact_check_results = await fact_checker.check_claims(
-            text=article_data.get("text", ""), title=article_data.get("title", "")
+    async def fact_check_stage() -> Dict[str, Any]:
+        fact_check_results = await _run_stage(
+            "fact_checks",
+            fact_checker.check_claims(text=text, title=title),
+            _fact_check_fallback,
+            failed_stages,
         )
+        return {"fact_checks": fact_check_results}
+
+    print("Analyzing credibility, checking claims and searching similar articles...")
+    return tier, [credibility_stage(), fact_check_stage(), similar_articles_stage()]
 
-        print("Searching for similar articles...")
-        similar_articles = await news_searcher.find_similar(
-            query=article_data.get("title", ""), exclude_domain=url
+
+async def verify_article_handler(
+    request: URLVerificationRequest,
+    article_extractor: ArticleExtractor,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+    combined_analyzer: Optional[CombinedAnalyzer] = None,
+    heuristic_scorer: Optional[HeuristicScorer] = None,
+) -> Dict[str, Any]:
+    url = str(request.url)
+    return await verify_flight.do(
+        f"{request.tier}:{canonicalize_url(url)}",
+        lambda: _verify_article(
+            url,
+            request.tier,
+            article_extractor,
+            fact_checker,
+            news_searcher,
+            credibility_scorer,
+            combined_analyzer,
+            heuristic_scorer or HeuristicScorer(),
+        ),
+    )
+
+
+async def _verify_article(
+    url: str,
+    tier: str,
+    article_extractor: ArticleExtractor,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+    combined_analyzer: Optional[CombinedAnalyzer],
+    heuristic_scorer: HeuristicScorer,
+) -> Dict[str, Any]:
+    try:
+        article_data = await _extract_article(url, article_extractor)
+
+        failed_stages: List[str] = []
+        analysis_tier, stages = await _analysis_stages(
+            url,
+            article_data,
+            fact_checker,
+            news_searcher,
+            credibility_scorer,
+            combined_analyzer,
+            heuristic_scorer,
+            tier,
+            failed_stages,
         )
+        stage_results = await asyncio.gather(*stages)
 
-        return {
-            "success": True,
-            "article": {
-                "title": article_data.get("title", ""),
-                "author": article_data.get("author", ""),
-                "publish_date": article_data.get("publish_date", ""),
-                "summary": article_data.get("summary", ""),
-                "text_preview": article_data.get("text", "")[:500] + "...",
-                "top_image": article_data.get("top_image", ""),
-            },
-            "credibility": credibility_data,
-            "fact_checks": fact_check_results,
-            "similar_articles": similar_articles,
-        }
+        response = {"success": True, "article": _article_payload(article_data)}
+        for stage_result in stage_results:
+            response.update(stage_result)
+        response["analysis_tier"] = analysis_tier
+        response["partial"] = bool(failed_stages)
+        response["failed_stages"] = failed_stages
+        return response
 
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error in verify_article_handler: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
+
+
+async def verify_article_stream_handler(
+    request: URLVerificationRequest,
+    article_extractor: ArticleExtractor,
+    fact_checker: FactChecker,
+    news_searcher: NewsSearcher,
+    credibility_scorer: CredibilityScorer,
+    combined_analyzer: Optional[CombinedAnalyzer] = None,
+    heuristic_scorer: Optional[HeuristicScorer] = None,
+) -> StreamingResponse:
+    url = str(request.url)
+    heuristic_scorer = heuristic_scorer or HeuristicScorer()
+
+    async def stream_events():
+        try:
+            article_data = await _extract_article(url, article_extractor)
+        except HTTPException as e:
+            yield format_sse(
+                "error", {"status_code": e.status_code, "detail": e.detail}
+            )
+            return
+        except Exception as e:
+            print(f"Error in verify_article_stream_handler: {str(e)}")
+            yield format_sse("error", {"status_code": 500, "detail": str(e)})
+            return
+
+        yield format_sse("extraction", {"article": _article_payload(article_data)})
+
+        failed_stages: List[str] = []
+        analysis_tier, stages = await _analysis_stages(
+            url,
+            article_data,
+            fact_checker,
+            news_searcher,
+            credibility_scorer,
+            combined_analyzer,
+            heuristic_scorer,
+            request.tier,
+            failed_stages,
+        )
+        tasks = [asyncio.create_task(stage) for stage in stages]
+        try:
+            for next_stage in asyncio.as_completed(tasks):
+                stage_result = await next_stage
+                for key, value in stage_result.items():
+                    yield format_sse(STREAM_EVENTS[key], {key: value})
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        yield format_sse(
+            "complete",
+            {
+                "success": True,
+                "analysis_tier": analysis_tier,
+                "partial": bool(failed_stages),
+                "failed_stages": failed_stages,
+            },
+        )
+
+    return StreamingResponse(
+        verify_flight.stream(f"{request.tier}:{canonicalize_url(url)}", stream_events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,24 +1,246 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse
 from pydantic import HttpUrl, BaseModel
+from contextlib import asynccontextmanager
+import asyncio
+import importlib
 import os
 from dotenv import load_dotenv
 
+load_dotenv()
+
 from services.article_extractor import ArticleExtractor
 from services.fact_checker import FactChecker
 from services.news_searcher import NewsSearcher
 from services.credibility_scorer import CredibilityScorer
+from services.combined_analyzer import CombinedAnalyzer
+from services.heuristic_scorer import HeuristicScorer
+from services.gemini_client import GeminiClient
+from utils.cache import cache_from_env, LLMResponseCache, SQLiteStore
+from utils.concurrency import run_blocking
+from utils.jobs import JobManager
+from utils.metrics import REGISTRY, CallbackMetric, MetricsMiddleware
+from utils.profiling import (
+    PROFILING_ENABLED,
+    ProfilingMiddleware,
+    profile_path,
+    profile_pending,
+)
+from utils.rate_limiter import limiter_stats
+from utils.tracing import tracer, TracingMiddleware
 
 import sys
 
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from api.verification import verify_article_handler, URLVerificationRequest
-from api.search import search_news_handler, NewsSearchRequest
+from api.verification import (
+    verify_article_handler,
+    verify_article_stream_handler,
+    verify_flight,
+    URLVerificationRequest,
+)
+from api.search import (
+    search_news_handler,
+    search_news_stream_handler,
+    search_flight,
+    NewsSearchRequest,
+)
+from api.batch import verify_batch_handler, BatchVerificationRequest
+from api.jobs import (
+    submit_verify_job_handler,
+    submit_search_job_handler,
+    get_job_handler,
+)
+
+WARMUP_TIMEOUT = float(os.getenv("WARMUP_TIMEOUT", "5"))
+STARTUP_WARMUP = os.getenv("STARTUP_WARMUP", "blocking").lower()
+CACHE_PRUNE_INTERVAL = float(os.getenv("CACHE_PRUNE_INTERVAL", "600"))
 
-load_dotenv()
+extraction_cache = None
+article_extractor = None
+llm_cache = None
+gemini_client = None
+fact_checker = None
+news_searcher = None
+credibility_scorer = None
+heuristic_scorer = None
+combined_analyzer = None
 
-app = FastAPI()
+JOB_RESULT_TTL = float(os.getenv("JOB_RESULT_TTL", "3600"))
+JOB_STORE_DB = os.getenv("JOB_STORE_DB")
+
+job_manager = JobManager(
+    workers=int(os.getenv("JOB_WORKERS", "4")),
+    max_queue=int(os.getenv("JOB_QUEUE_SIZE", "100")),
+    result_ttl=JOB_RESULT_TTL,
+    store=(
+        SQLiteStore(JOB_STORE_DB, ttl=JOB_RESULT_TTL, table="jobs")
+        if JOB_STORE_DB
+        else None
+    ),
+)
+
+
+def build_services():
+    global extraction_cache, article_extractor, llm_cache, gemini_client
+    global fact_checker, news_searcher, credibility_scorer, heuristic_scorer
+    global combined_analyzer
+
+    extraction_cache = cache_from_env("EXTRACTION", default_ttl=6 * 3600)
+    article_extractor = ArticleExtractor(cache=extraction_cache)
+    llm_cache = LLMResponseCache(
+        cache_from_env("LLM", default_ttl=24 * 3600),
+        max_entry_bytes=int(os.getenv("LLM_CACHE_MAX_ENTRY_KB", "64")) * 1024,
+    )
+    gemini_client = GeminiClient(
+        api_key=os.getenv("GEMINI_API_KEY"), response_cache=llm_cache
+    )
+    fact_checker = FactChecker(
+        api_key=os.getenv("GEMINI_API_KEY"), gemini_client=gemini_client
+    )
+    news_searcher = NewsSearcher(api_key=os.getenv("NEWSAPI_KEY"))
+    credibility_scorer = CredibilityScorer(
+        api_key=os.getenv("GEMINI_API_KEY"), gemini_client=gemini_client
+    )
+    heuristic_scorer = HeuristicScorer(credibility_scorer.reputation_index)
+    combined_analyzer = None
+    if os.getenv("COMBINED_ANALYSIS", "false").lower() == "true":
+        combined_analyzer = CombinedAnalyzer(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            credibility_scorer=credibility_scorer,
+            gemini_client=gemini_client,
+        )
+
+
+async def warm_up():
+    results = await asyncio.gather(
+        gemini_client.warm_up(WARMUP_TIMEOUT),
+        news_searcher.warm_up(WARMUP_TIMEOUT),
+        run_blocking(importlib.import_module, "newspaper"),
+        return_exceptions=True,
+    )
+    for name, result in zip(("Gemini", "NewsAPI", "newspaper"), results):
+        if isinstance(result, BaseException):
+            print(f"{name} warm-up failed: {type(result).__name__} {str(result)}")
+        else:
+            print(f"{name} warmed up")
+
+
+async def prune_caches():
+    while True:
+        for name, cache in (
+            ("extraction", extraction_cache),
+            ("llm", llm_cache),
+            ("job", job_manager),
+        ):
+            try:
+                removed = await run_blocking(cache.prune)
+                if removed:
+                    print(f"Pruned {removed} entries from the {name} cache")
+            except Exception as e:
+                print(f"Failed to prune the {name} cache: {str(e)}")
+        await asyncio.sleep(CACHE_PRUNE_INTERVAL)
+
+
+def cache_metric_values(field: str):
+    values = {}
+    for cache_name, cache in (("extraction", extraction_cache), ("llm", llm_cache)):
+        if cache is None:
+            continue
+        for tier, tier_stats in cache.stats().items():
+            if isinstance(tier_stats, dict):
+                values[(cache_name, tier)] = tier_stats[field]
+    return values
+
+
+def cache_lookup_values():
+    values = {}
+    for result, field in (("hit", "hits"), ("miss", "misses")):
+        for (cache_name, tier), count in cache_metric_values(field).items():
+            values[(cache_name, tier, result)] = count
+    return values
+
+
+REGISTRY.register(
+    CallbackMetric(
+        "validata_cache_lookups_total",
+        "Cache lookups by cache, tier and result.",
+        ("cache", "tier", "result"),
+        cache_lookup_values,
+        kind="counter",
+    )
+)
+REGISTRY.register(
+    CallbackMetric(
+        "validata_cache_hit_ratio",
+        "Fraction of cache lookups that were hits.",
+        ("cache", "tier"),
+        lambda: cache_metric_values("hit_ratio"),
+    )
+)
+REGISTRY.register(
+    CallbackMetric(
+        "validata_rate_limiter_waiting",
+        "Upstream calls waiting for a rate limiter slot.",
+        ("upstream",),
+        lambda: {
+            (name,): stats["queue_depth"] for name, stats in limiter_stats().items()
+        },
+    )
+)
+REGISTRY.register(
+    CallbackMetric(
+        "validata_job_queue_depth",
+        "Background jobs waiting for a worker.",
+        (),
+        lambda: {(): job_manager.stats()["queue_depth"]},
+    )
+)
+REGISTRY.register(
+    CallbackMetric(
+        "validata_coalesced_requests_total",
+        "Requests that joined an identical in-flight request.",
+        ("endpoint",),
+        lambda: {
+            ("verify",): verify_flight.stats()["coalesced"],
+            ("search",): search_flight.stats()["coalesced"],
+        },
+        kind="counter",
+    )
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    build_services()
+    tracer.start()
+    warm_up_task = None
+    if STARTUP_WARMUP == "background":
+        warm_up_task = asyncio.create_task(warm_up())
+    elif STARTUP_WARMUP != "off":
+        await warm_up()
+    await job_manager.start()
+    prune_task = asyncio.create_task(prune_caches())
+    try:
+        yield
+    finally:
+        prune_task.cancel()
+        if warm_up_task is not None:
+            warm_up_task.cancel()
+        await job_manager.stop()
+        await gemini_client.close()
+        news_searcher.close()
+        extraction_cache.close()
+        llm_cache.close()
+        tracer.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(TracingMiddleware)
 
 app.add_middleware(
     CORSMiddleware,
@@ -28,11 +250,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-article_extractor = ArticleExtractor()
-fact_checker = FactChecker(api_key=os.getenv("GEMINI_API_KEY"))
-news_searcher = NewsSearcher(api_key=os.getenv("NEWSAPI_KEY"))
-credibility_scorer = CredibilityScorer(api_key=os.getenv("GEMINI_API_KEY"))
-
 
 @app.get("/")
 def read_root():
@@ -41,8 +258,17 @@ def read_root():
         "version": "1.0.0",
         "endpoints": {
             "verify_article": "/api/verify",
+            "verify_article_stream": "/api/verify/stream",
+            "verify_batch": "/api/verify/batch",
             "search_news": "/api/search",
+            "search_news_stream": "/api/search/stream",
+            "submit_verify_job": "/api/jobs/verify",
+            "submit_search_job": "/api/jobs/search",
+            "job_status": "/api/jobs/{job_id}",
             "health": "/health",
+            "stats": "/stats",
+            "metrics": "/metrics",
+            "profile": "/profiles/{profile_id}",
         },
     }
 
@@ -52,10 +278,79 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/stats")
+def stats():
+    return {
+        "extraction_cache": extraction_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "jobs": job_manager.stats(),
+        "rate_limits": limiter_stats(),
+        "coalescing": {
+            "verify": verify_flight.stats(),
+            "search": search_flight.stats(),
+        },
+        "tracing": tracer.stats(),
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiles/{profile_id}")
+def get_profile(profile_id: str):
+    path = profile_path(profile_id) if PROFILING_ENABLED else None
+    if path is None and PROFILING_ENABLED and profile_pending(profile_id):
+        return JSONResponse(
+            {
+                "status": "pending",
+                "detail": "Profile is written once the response completes",
+            },
+            status_code=202,
+            headers={"Retry-After": "1"},
+        )
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain")
+
+
 @app.post("/api/verify")
 async def verify_article(request: URLVerificationRequest):
     return await verify_article_handler(
-        request, article_extractor, fact_checker, news_searcher, credibility_scorer
+        request,
+        article_extractor,
+        fact_checker,
+        news_searcher,
+        credibility_scorer,
+        combined_analyzer,
+        heuristic_scorer,
+    )
+
+
+@app.post("/api/verify/stream")
+async def verify_article_stream(request: URLVerificationRequest):
+    return await verify_article_stream_handler(
+        request,
+        article_extractor,
+        fact_checker,
+        news_searcher,
+        credibility_scorer,
+        combined_analyzer,
+        heuristic_scorer,
+    )
+
+
+@app.post("/api/verify/batch")
+async def verify_batch(request: BatchVerificationRequest):
+    return await verify_batch_handler(
+        request,
+        article_extractor,
+        fact_checker,
+        news_searcher,
+        credibility_scorer,
+        combined_analyzer,
+        heuristic_scorer,
     )
 
 
@@ -66,6 +361,39 @@ async def search_news(request: NewsSearchRequest):
     )
 
 
+@app.post("/api/search/stream")
+async def search_news_stream(request: NewsSearchRequest):
+    return await search_news_stream_handler(
+        request, fact_checker, news_searcher, credibility_scorer
+    )
+
+
+@app.post("/api/jobs/verify", status_code=202)
+async def submit_verify_job(request: URLVerificationRequest):
+    return await submit_verify_job_handler(
+        request,
+        job_manager,
+        article_extractor,
+        fact_checker,
+        news_searcher,
+        credibility_scorer,
+        combined_analyzer,
+        heuristic_scorer,
+    )
+
+
+@app.post("/api/jobs/search", status_code=202)
+async def submit_search_job(request: NewsSearchRequest):
+    return await submit_search_job_handler(
+        request, job_manager, fact_checker, news_searcher, credibility_scorer
+    )
+
+
+@app.get("/api/jobs/{job_id}")
+async def get_job(job_id: str):
+    return await get_job_handler(job_id, job_manager)
+
+
 if __name__ == "__main__":
     import uvicorn
 
@@ -0,0 +1,271 @@
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+from bs4 import BeautifulSoup
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from services.article_extractor import ArticleExtractor
+
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baselines", "extraction.json")
+TIMED_METRICS = ("p50_ms", "p99_ms")
+MEMORY_METRIC = "peak_kb"
+
+DATE_STRINGS = [
+    "2024-05-14T18:32:00+0200",
+    "2024-05-14T18:32:00.123+0200",
+    "2024-07-19T21:05:00Z",
+    "2024-03-05 09:15:00",
+    "2024-02-11",
+    "June 2, 2024",
+    "Jun 2, 2024",
+    "2 June 2024",
+    "2 Jun 2024",
+    "not a date",
+]
+
+
+def load_corpus(corpus_dir: str) -> List[Dict[str, Any]]:
+    with open(os.path.join(corpus_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    documents = []
+    for entry in manifest:
+        with open(os.path.join(corpus_dir, entry["file"]), "rb") as f:
+            content = f.read()
+        documents.append({**entry, "content": content})
+    return documents
+
+
+def recorded_response(url: str, status: int, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.url = url
+    response.status_code = status
+    response._content = content
+    response.encoding = "utf-8"
+    return response
+
+
+def disable_network() -> None:
+    def refuse(self, method, url, *args, **kwargs):
+        raise requests.ConnectionError(f"Network disabled in benchmark: {url}")
+
+    requests.Session.request = refuse
+
+
+def offline_extractor(documents: List[Dict[str, Any]]) -> ArticleExtractor:
+    responses = {doc["url"]: doc for doc in documents}
+
+    def get(url: str) -> requests.Response:
+        doc = responses.get(url)
+        if doc is None:
+            return recorded_response(url, 404, b"")
+        return recorded_response(url, doc["status"], doc["content"])
+
+    extractor = ArticleExtractor()
+    extractor._get = get
+    return extractor
+
+
+def benchmark_cases(
+    documents: List[Dict[str, Any]], extractor: ArticleExtractor
+) -> Dict[str, Tuple[List[Any], Callable[[Any], Any]]]:
+    pages = [(doc["url"], doc["content"].decode("utf-8")) for doc in documents]
+    soups = [BeautifulSoup(html, "html.parser") for _, html in pages]
+    return {
+        "extract": ([url for url, _ in pages], extractor.extract),
+        "metadata": (soups, extractor._extract_metadata),
+        "fallback": (pages, lambda page: extractor._fallback_extraction(*page)),
+        "parse_date": (DATE_STRINGS, extractor._parse_date),
+    }
+
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    index = max(0, math.ceil(q / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+def time_case(
+    inputs: List[Any], func: Callable[[Any], Any], iterations: int
+) -> List[float]:
+    latencies = []
+    for _ in range(iterations):
+        for item in inputs:
+            started = time.perf_counter()
+            func(item)
+            latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+def peak_memory(inputs: List[Any], func: Callable[[Any], Any]) -> int:
+    # Restarted per document rather than using tracemalloc.reset_peak(), which
+    # needs Python 3.9.
+    peak = 0
+    for item in inputs:
+        tracemalloc.start()
+        try:
+            func(item)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return peak
+
+
+def run_case(
+    inputs: List[Any],
+    func: Callable[[Any], Any],
+    iterations: int,
+    warmup: int,
+    repeats: int,
+) -> Dict[str, float]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            for item in inputs:
+                func(item)
+        rounds = [time_case(inputs, func, iterations) for _ in range(repeats)]
+        peak = peak_memory(inputs, func)
+
+    result = {
+        "documents": len(inputs),
+        "docs_per_sec": round(max(len(r) / sum(r) for r in rounds), 1),
+        "peak_kb": round(peak / 1024, 1),
+    }
+    # The fastest repeat is the least disturbed by the rest of the machine; the
+    # spread between repeats is how much a single run can be trusted.
+    for q in (50, 99):
+        values = [percentile(latencies, q) for latencies in rounds]
+        result[f"p{q}_ms"] = round(min(values) * 1000, 3)
+        result[f"p{q}_noise"] = round(max(values) / min(values) - 1, 3)
+    return result
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    memory_threshold: float,
+    noise_floor_ms: float,
+) -> List[str]:
+    regressions = []
+    for case, result in results.items():
+        previous = baseline.get(case)
+        if previous is None:
+            continue
+        limits = {MEMORY_METRIC: memory_threshold}
+        for metric in TIMED_METRICS:
+            noise = metric.replace("_ms", "_noise")
+            limits[metric] = max(
+                threshold, result.get(noise, 0), previous.get(noise, 0)
+            )
+        for metric, limit in limits.items():
+            if not previous.get(metric):
+                continue
+            change = result[metric] / previous[metric] - 1
+            if metric in TIMED_METRICS and (
+                result[metric] - previous[metric] <= noise_floor_ms
+            ):
+                continue
+            if change > limit:
+                regressions.append(
+                    f"{case} {metric}: {previous[metric]} -> {result[metric]} "
+                    f"(+{change * 100:.0f}%, limit {limit * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_results(
+    results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Any]]
+) -> None:
+    print(
+        f"{'case':<12} {'docs':>5} {'docs/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+        f"{'noise':>7} {'peak KB':>9}"
+    )
+    for case, result in results.items():
+        print(
+            f"{case:<12} {result['documents']:>5} {result['docs_per_sec']:>9} "
+            f"{result['p50_ms']:>9} {result['p99_ms']:>9} "
+            f"{result['p99_noise'] * 100:>6.0f}% {result['peak_kb']:>9}"
+        )
+        previous = (baseline or {}).get(case)
+        if previous:
+            deltas = " ".join(
+                f"{metric} {(result[metric] / previous[metric] - 1) * 100:+.0f}%"
+                for metric in TIMED_METRICS + (MEMORY_METRIC,)
+                if previous.get(metric)
+            )
+            print(f"{'':<12} vs baseline: {deltas}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ArticleExtractor over the recorded HTML corpus."
+    )
+    parser.add_argument("--corpus", default=CORPUS_DIR)
+    parser.add_argument("--case", action="append", dest="cases")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    parser.add_argument("--noise-floor-ms", type=float, default=1.0)
+    parser.add_argument("--memory-threshold", type=float, default=0.1)
+    args = parser.parse_args()
+
+    disable_network()
+    documents = load_corpus(args.corpus)
+    cases = benchmark_cases(documents, offline_extractor(documents))
+    selected = args.cases or list(cases)
+
+    results = {}
+    for case in selected:
+        inputs, func = cases[case]
+        results[case] = run_case(
+            inputs, func, args.iterations, args.warmup, args.repeats
+        )
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print_results(results, None)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        return
+
+    regressions = compare(
+        results, baseline, args.threshold, args.memory_threshold, args.noise_floor_ms
+    )
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print("No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from startup import free_port
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+
+ARTICLES = [
+    "wire-story.html",
+    "byline-class.html",
+    "opinion.html",
+    "liveblog.html",
+    "longform.html",
+    "no-metadata.html",
+    "paywall-403.html",
+]
+QUERIES = [
+    "council road repair budget",
+    "coastal nitrate pollution study",
+    "airline passenger compensation rules",
+    "central station fire",
+    "cloud revenue quarterly earnings",
+    "fishing industry recovery",
+]
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def stream_outcome(body: str) -> Tuple[bool, bool]:
+    failed, partial = False, False
+    for message in body.split("\n\n"):
+        lines = dict(
+            line.split(": ", 1) for line in message.splitlines() if ": " in line
+        )
+        if lines.get("event") == "error":
+            failed = True
+        elif lines.get("event") == "complete":
+            complete = json.loads(lines.get("data", "{}"))
+            partial = bool(complete.get("partial"))
+    return failed, partial
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class LoopLagMonitor:
+    def __init__(self, interval: float = 0.05, max_samples: int = 100000):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=max_samples)
+
+    async def run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(time.perf_counter() - started - self.interval)
+
+    def snapshot(self, reset: bool = False) -> Dict[str, float]:
+        samples = list(self.samples)
+        if reset:
+            self.samples.clear()
+        return {
+            "samples": len(samples),
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            "max_ms": round(max(samples, default=0) * 1000, 2),
+        }
+
+
+def allow_only_loopback() -> None:
+    import requests
+
+    request = requests.Session.request
+
+    def loopback_request(self, method, url, *args, **kwargs):
+        if urlparse(url).hostname not in LOOPBACK_HOSTS:
+            raise requests.ConnectionError(f"Network disabled in load test: {url}")
+        return request(self, method, url, *args, **kwargs)
+
+    requests.Session.request = loopback_request
+
+
+async def serve(port: int) -> None:
+    sys.path.insert(0, BACKEND_DIR)
+    allow_only_loopback()
+
+    import uvicorn
+
+    import app as backend
+    from stubs import FakeGenerativeService
+
+    build_services = backend.build_services
+
+    def build_services_with_fakes():
+        build_services()
+        backend.gemini_client._client = FakeGenerativeService.from_env()
+
+    backend.build_services = build_services_with_fakes
+
+    monitor = LoopLagMonitor()
+
+    def loop_lag(reset: bool = False):
+        return monitor.snapshot(reset)
+
+    backend.app.add_api_route("/loadtest/loop-lag", loop_lag, methods=["GET"])
+
+    server = uvicorn.Server(
+        uvicorn.Config(backend.app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    monitor_task = asyncio.create_task(monitor.run())
+    try:
+        await server.serve()
+    finally:
+        monitor_task.cancel()
+
+
+def wait_for_health(url: str, process: subprocess.Popen, timeout: float) -> None:
+    started = time.perf_counter()
+    while time.perf_counter() - started < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"{url} exited with code {process.returncode}")
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            time.sleep(0.05)
+    raise TimeoutError(f"{url}/health not served within {timeout}s")
+
+
+async def drive(
+    app_url: str,
+    stub_url: str,
+    concurrency: int,
+    duration: float,
+    search_ratio: float,
+    stream_ratio: float,
+    hot_ratio: float,
+    tier: str,
+    timeout: float,
+) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: Dict[str, int] = defaultdict(int)
+    partial: Dict[str, int] = defaultdict(int)
+    counter = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal counter
+        while time.perf_counter() < deadline:
+            counter += 1
+            if random.random() < search_ratio:
+                endpoint = "search"
+                body = {"query": random.choice(QUERIES)}
+            else:
+                endpoint = "verify"
+                # Hot requests all ask for the same article, like a viral link;
+                # the rest get a distinct URL so nothing is coalesced or cached.
+                if random.random() < hot_ratio:
+                    url = f"{stub_url}/articles/{ARTICLES[0]}"
+                else:
+                    url = f"{stub_url}/articles/{random.choice(ARTICLES)}?r={counter}"
+                body = {"url": url, "tier": tier}
+            stream = random.random() < stream_ratio
+            if stream:
+                endpoint += "-stream"
+
+            started = time.perf_counter()
+            try:
+                response = await client.post(
+                    f"/api/{endpoint.replace('-', '/')}", json=body
+                )
+                failed = response.status_code != 200
+                if stream and not failed:
+                    failed, is_partial = stream_outcome(response.text)
+                else:
+                    is_partial = not failed and response.json().get("partial")
+                if is_partial:
+                    partial[endpoint] += 1
+            except httpx.HTTPError:
+                failed = True
+            latencies[endpoint].append(time.perf_counter() - started)
+            if failed:
+                errors[endpoint] += 1
+
+    async with httpx.AsyncClient(
+        base_url=app_url,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        await client.get("/loadtest/loop-lag", params={"reset": True})
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+        loop_lag = (await client.get("/loadtest/loop-lag")).json()
+        coalescing = (await client.get("/stats")).json()["coalescing"]
+
+    return {
+        "elapsed": elapsed,
+        "latencies": latencies,
+        "errors": errors,
+        "partial": partial,
+        "loop_lag": loop_lag,
+        "coalescing": coalescing,
+    }
+
+
+def print_report(results: Dict[str, Any]) -> None:
+    elapsed = results["elapsed"]
+    total = sum(len(values) for values in results["latencies"].values())
+    print(f"{total} requests in {elapsed:.1f}s ({total / elapsed:.1f} req/s)")
+    print(
+        f"{'endpoint':<13} {'requests':>8} {'errors':>7} {'partial':>7} {'req/s':>7} "
+        f"{'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+    )
+    for endpoint, values in sorted(results["latencies"].items()):
+        print(
+            f"{endpoint:<13} {len(values):>8} {results['errors'][endpoint]:>7} "
+            f"{results['partial'][endpoint]:>7} "
+            f"{len(values) / elapsed:>7.1f} "
+            f"{percentile(values, 50) * 1000:>8.0f} "
+            f"{percentile(values, 90) * 1000:>8.0f} "
+            f"{percentile(values, 99) * 1000:>8.0f} "
+            f"{max(values) * 1000:>8.0f}"
+        )
+    lag = results["loop_lag"]
+    print(
+        f"event loop lag: p50 {lag['p50_ms']} ms, p99 {lag['p99_ms']} ms, "
+        f"max {lag['max_ms']} ms over {lag['samples']} samples"
+    )
+    for name, flight in sorted(results["coalescing"].items()):
+        print(
+            f"{name} coalescing: {flight['executed']} executed, "
+            f"{flight['coalesced']} joined an identical request"
+        )
+
+
+def loadtest_env(stub_url: str, use_cache: bool) -> Dict[str, str]:
+    env = dict(os.environ)
+    env.update(
+        {
+            "GEMINI_API_KEY": "loadtest",
+            "NEWSAPI_KEY": "loadtest",
+            "NEWSAPI_BASE_URL": f"{stub_url}/v2",
+            "STARTUP_WARMUP": "off",
+        }
+    )
+    if not use_cache:
+        env["EXTRACTION_CACHE_MAX_ENTRIES"] = "0"
+        env["LLM_CACHE_MAX_ENTRIES"] = "0"
+        env.pop("EXTRACTION_CACHE_DB", None)
+        env.pop("LLM_CACHE_DB", None)
+    return env
+
+
+def run(args: argparse.Namespace) -> None:
+    stub_port = free_port()
+    app_port = args.port or free_port()
+    stub_url = f"http://127.0.0.1:{stub_port}"
+    app_url = f"http://127.0.0.1:{app_port}"
+    env = loadtest_env(stub_url, args.cache)
+
+    processes = []
+    try:
+        for script, port, url in (
+            ("stubs.py", stub_port, stub_url),
+            ("loadtest.py", app_port, app_url),
+        ):
+            command = [sys.executable, os.path.join(BENCHMARK_DIR, script)]
+            if script == "loadtest.py":
+                command.append("serve")
+            process = subprocess.Popen(
+                command + ["--port", str(port)],
+                cwd=BACKEND_DIR,
+                env=env,
+                stdout=None if args.verbose else subprocess.DEVNULL,
+                stderr=None if args.verbose else subprocess.DEVNULL,
+            )
+            processes.append(process)
+            wait_for_health(url, process, args.startup_timeout)
+
+        print(
+            f"Driving {args.concurrency} concurrent clients for {args.duration:.0f}s "
+            f"({args.search_ratio * 100:.0f}% search, "
+            f"{args.stream_ratio * 100:.0f}% streamed, "
+            f"{args.hot_ratio * 100:.0f}% hot article, tier={args.tier})"
+        )
+        print_report(
+            asyncio.run(
+                drive(
+                    app_url,
+                    stub_url,
+                    args.concurrency,
+                    args.duration,
+                    args.search_ratio,
+                    args.stream_ratio,
+                    args.hot_ratio,
+                    args.tier,
+                    args.timeout,
+                )
+            )
+        )
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Load-test the API against local NewsAPI and Gemini stand-ins."
+    )
+    parser.add_argument("mode", nargs="?", choices=("run", "serve"), default="run")
+    parser.add_argument("--port", type=int)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--search-ratio", type=float, default=0.3)
+    parser.add_argument("--stream-ratio", type=float, default=0.5)
+    parser.add_argument("--hot-ratio", type=float, default=0)
+    parser.add_argument("--tier", choices=("fast", "full", "auto"), default="full")
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--startup-timeout", type=float, default=60)
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(serve(args.port or 8000))
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
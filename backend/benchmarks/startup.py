@@ -0,0 +1,125 @@
+import argparse
+import http.client
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark_env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.setdefault("NEWSAPI_KEY", "benchmark")
+    # Warm-up would dial Gemini and NewsAPI with the fake keys.
+    env.setdefault("STARTUP_WARMUP", "off")
+    return env
+
+
+def import_costs(module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=benchmark_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    modules = defaultdict(float)
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+
+        depth = (len(name) - len(name.lstrip())) // 2
+        name = name.strip()
+        seconds = int(cumulative) / 1_000_000
+        if name == module:
+            total = seconds
+        elif depth == 1:
+            modules[name] += seconds
+
+    return total, sorted(modules.items(), key=lambda item: item[1], reverse=True)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_health(timeout: float) -> float:
+    port = free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=BACKEND_DIR,
+        env=benchmark_env(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+                connection.request("GET", "/health")
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(f"/health not served within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure backend import cost and cold start to /health."
+    )
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--skip-server", action="store_true")
+    args = parser.parse_args()
+
+    total, modules = import_costs(args.module)
+    print(f"import {args.module}: {total * 1000:.0f} ms")
+    for name, seconds in modules[: args.top]:
+        print(f"  {name:<32} {seconds * 1000:8.1f} ms")
+
+    if args.skip_server:
+        return
+
+    timings = [time_to_health(args.timeout) for _ in range(args.runs)]
+    print(
+        f"cold start to /health: median {statistics.median(timings) * 1000:.0f} ms, "
+        f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms "
+        f"over {args.runs} runs"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Request
+from google.ai import generativelanguage_v1beta as glm
+from fastapi.responses import JSONResponse, Response
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCHMARK_DIR)
+sys.path.insert(0, BACKEND_DIR)
+
+from services import llm_schemas
+from services.gemini_client import response_schema
+
+CORPUS_DIR = os.path.join(BENCHMARK_DIR, "corpus")
+P99_Z = 2.326
+
+NEWS_SOURCES = [
+    ("reuters", "Reuters", "reuters.com"),
+    ("associated-press", "Associated Press", "apnews.com"),
+    ("bbc-news", "BBC News", "bbc.co.uk"),
+    ("the-guardian", "The Guardian", "theguardian.com"),
+    ("npr", "NPR", "npr.org"),
+    ("cnn", "CNN", "cnn.com"),
+    ("fox-news", "Fox News", "foxnews.com"),
+    ("al-jazeera-english", "Al Jazeera English", "aljazeera.com"),
+    ("breitbart-news", "Breitbart News", "breitbart.com"),
+    (None, "Daily Mail", "dailymail.co.uk"),
+]
+
+CANNED_RESPONSES: Dict[str, Dict[str, Any]] = {
+    "CredibilityAnalysis": {
+        "scores": {
+            "source_reputation": 7,
+            "writing_quality": 8,
+            "evidence_quality": 6,
+            "objectivity": 7,
+            "transparency": 6,
+        },
+        "bias": "center",
+        "sensationalism": "low",
+        "concerns": [
+            "Relies on a single official source for the budget figures",
+            "Revenue forecasts are not independently verified",
+        ],
+        "strengths": [
+            "Quotes named officials on both sides",
+            "Cites the state auditor's report directly",
+        ],
+    },
+    "FactCheckAnalysis": {
+        "claims": [
+            {
+                "claim": "The council voted 7-2 to approve $14.2 million for road repairs.",
+                "verifiability": "Verifiable",
+                "reasoning": "Council voting records and budget documents are public.",
+            },
+            {
+                "claim": "Maintenance spending fell by 18 percent over five years.",
+                "verifiability": "Partially Verifiable",
+                "reasoning": "Attributed to an auditor's report that is not linked.",
+            },
+            {
+                "claim": "The project could create about 900 temporary jobs.",
+                "verifiability": "Difficult to Verify",
+                "reasoning": "A projection based on an unpublished estimate.",
+            },
+        ],
+        "manipulation_tactics": [],
+    },
+    "NeutralSummary": {
+        "consensus_summary": (
+            "Outlets agree the council approved the repair budget after a split "
+            "vote, but differ on how reliable the revenue forecasts are."
+        ),
+        "points_of_agreement": [
+            "The budget passed by a 7-2 vote",
+            "Construction is scheduled to begin in the spring",
+        ],
+        "points_of_disagreement": [
+            "Whether revenue forecasts are realistic",
+            "How many jobs the project will create",
+        ],
+        "media_literacy_tip": (
+            "Check whether budget figures are quoted from the published documents "
+            "or from officials' statements."
+        ),
+    },
+}
+CANNED_RESPONSES["CombinedAnalysis"] = {
+    "credibility": CANNED_RESPONSES["CredibilityAnalysis"],
+    "fact_checks": CANNED_RESPONSES["FactCheckAnalysis"],
+}
+
+
+class StubUpstreamError(Exception):
+    pass
+
+
+class LatencyModel:
+    def __init__(self, median_ms: float, p99_ms: float):
+        self.median = median_ms / 1000
+        self.sigma = math.log(max(p99_ms, median_ms) / median_ms) / P99_Z
+
+    @classmethod
+    def from_env(cls, name: str, default: str) -> "LatencyModel":
+        median, p99 = os.getenv(name, default).split(",")
+        return cls(float(median), float(p99))
+
+    def sample(self) -> float:
+        return self.median * math.exp(random.gauss(0, self.sigma))
+
+
+class UpstreamStub:
+    def __init__(self, prefix: str, default_latency: str):
+        self.latency = LatencyModel.from_env(
+            f"STUB_{prefix}_LATENCY_MS", default_latency
+        )
+        self.error_rate = float(os.getenv(f"STUB_{prefix}_ERROR_RATE", "0"))
+
+    async def delay(self) -> None:
+        await asyncio.sleep(self.latency.sample())
+
+    def should_fail(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def _response(text: str) -> glm.GenerateContentResponse:
+    return glm.GenerateContentResponse(
+        candidates=[
+            glm.Candidate(
+                content=glm.Content(role="model", parts=[glm.Part(text=text)])
+            )
+        ]
+    )
+
+
+class _ChunkStream:
+    def __init__(self, chunks: List[str], delay: float):
+        self.chunks = chunks
+        self.delay = delay
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for chunk in self.chunks:
+            await asyncio.sleep(self.delay)
+            yield _response(chunk)
+
+
+class FakeGenerativeService:
+    def __init__(
+        self,
+        responses: Optional[Dict[str, Dict[str, Any]]] = None,
+        chunk_chars: int = 64,
+    ):
+        self.stub = UpstreamStub("GEMINI", "800,4000")
+        self.responses = {**CANNED_RESPONSES, **(responses or {})}
+        self.chunk_chars = chunk_chars
+        self.schemas = {
+            frozenset(response_schema(model)["properties"]): name
+            for name, model in vars(llm_schemas).items()
+            if name in self.responses
+        }
+
+    @classmethod
+    def from_env(cls) -> "FakeGenerativeService":
+        responses = None
+        path = os.getenv("STUB_GEMINI_RESPONSES")
+        if path:
+            with open(path, encoding="utf-8") as f:
+                responses = json.load(f)
+        return cls(responses=responses)
+
+    def _response_text(self, request: glm.GenerateContentRequest) -> str:
+        schema = request.generation_config.response_schema
+        name = self.schemas.get(frozenset(schema.properties))
+        if name is None:
+            raise StubUpstreamError("Stub Gemini has no canned response for schema")
+        return json.dumps(self.responses[name])
+
+    async def _latency(self) -> float:
+        latency = self.stub.latency.sample()
+        if self.stub.should_fail():
+            await asyncio.sleep(latency)
+            raise StubUpstreamError("Stub Gemini error")
+        return latency
+
+    async def generate_content(
+        self, request: glm.GenerateContentRequest
+    ) -> glm.GenerateContentResponse:
+        text = self._response_text(request)
+        await asyncio.sleep(await self._latency())
+        return _response(text)
+
+    async def stream_generate_content(
+        self, request: glm.GenerateContentRequest
+    ) -> _ChunkStream:
+        text = self._response_text(request)
+        latency = await self._latency()
+        chunks = [
+            text[i : i + self.chunk_chars]
+            for i in range(0, len(text), self.chunk_chars)
+        ]
+        await asyncio.sleep(latency / 2)
+        return _ChunkStream(chunks, latency / 2 / len(chunks))
+
+
+def load_corpus_pages() -> Dict[str, Dict[str, Any]]:
+    with open(os.path.join(CORPUS_DIR, "manifest.json"), encoding="utf-8") as f:
+        return {entry["file"]: entry for entry in json.load(f)}
+
+
+def news_articles(query: str, page_size: int) -> List[Dict[str, Any]]:
+    rng = random.Random(query)
+    articles = []
+    for index in range(page_size):
+        source_id, source_name, domain = rng.choice(NEWS_SOURCES)
+        slug = "-".join(query.lower().split()[:6]) or "news"
+        articles.append(
+            {
+                "source": {"id": source_id, "name": source_name},
+                "author": rng.choice(["Staff Reporter", "Jane Porter", None]),
+                "title": f"{query.title()}: what we know so far ({source_name})",
+                "description": (
+                    f"{source_name} reports on {query} with reaction from officials "
+                    "and independent experts."
+                ),
+                "url": f"https://www.{domain}/news/{slug}-{index}",
+                "urlToImage": f"https://www.{domain}/images/{slug}-{index}.jpg",
+                "publishedAt": f"2024-05-{1 + index % 28:02d}T{index % 24:02d}:00:00Z",
+                "content": f"Coverage of {query} continues to develop. [+1830 chars]",
+            }
+        )
+    return articles
+
+
+app = FastAPI()
+newsapi_stub = UpstreamStub("NEWSAPI", "120,600")
+publisher_stub = UpstreamStub("PUBLISHER", "60,400")
+corpus_pages = load_corpus_pages()
+
+
+@app.get("/health")
+def health_check():
+    return {"status": "healthy"}
+
+
+@app.get("/v2/everything")
+async def everything(request: Request):
+    await newsapi_stub.delay()
+    if newsapi_stub.should_fail():
+        return JSONResponse(
+            {
+                "status": "error",
+                "code": "unexpectedError",
+                "message": "Stub NewsAPI error",
+            },
+            status_code=500,
+        )
+
+    query = request.query_params.get("q", "")
+    page_size = int(request.query_params.get("pageSize", "20"))
+    return {
+        "status": "ok",
+        "totalResults": page_size * 7,
+        "articles": news_articles(query, page_size),
+    }
+
+
+@app.get("/articles/{name}")
+async def article(name: str):
+    await publisher_stub.delay()
+    page = corpus_pages.get(name)
+    if page is None or publisher_stub.should_fail():
+        return Response(status_code=404 if page is None else 503)
+
+    with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+        content = f.read()
+    return Response(
+        content, status_code=page["status"], media_type="text/html; charset=utf-8"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Serve local NewsAPI and publisher stand-ins."
+    )
+    parser.add_argument("--port", type=int, default=8900)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
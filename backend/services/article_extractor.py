@@ -1,11 +1,20 @@
 import requests
-from newspaper import Article, Config
 from bs4 import BeautifulSoup
 import re
-from typing import Dict
-from urllib.parse import urlparse
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse, urljoin
 from datetime import datetime
 
+from utils.cache import TieredCache
+from utils.helpers import canonicalize_url
+from utils.metrics import FALLBACKS
+from utils.tracing import span
+
+META_REFRESH_PATTERN = re.compile(
+    r"<meta[^>]+http-equiv=[\"']?refresh[\"']?[^>]*content=[\"']?\s*\d+\s*;\s*url=([^\"'>\s]+)",
+    re.I,
+)
+
 
 def extract_domain(url: str) -> str:
     try:
@@ -19,21 +28,54 @@ def extract_domain(url: str) -> str:
 
 
 class ArticleExtractor:
-    def __init__(self):
+    def __init__(self, cache: Optional[TieredCache] = None):
+        self.cache = cache
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
 
     def extract(self, url: str) -> Dict:
+        with span("extraction", url_domain=extract_domain(url)) as extraction_span:
+            if self.cache is None:
+                return self._extract(url)
+
+            cache_key = canonicalize_url(url)
+            cached = self.cache.get(cache_key)
+            extraction_span.set_attribute("cache_hit", cached is not None)
+            if cached is not None:
+                return {**cached, "url": url}
+
+            article_data = self._extract(url)
+            if article_data.get("text"):
+                self.cache.set(cache_key, article_data)
+            return article_data
+
+    def _extract(self, url: str) -> Dict:
+        try:
+            html, fetched_ok = self._fetch(url)
+        except Exception as e:
+            print(f"Article download failed: {str(e)}")
+            raise Exception(f"Could not extract article content: {str(e)}")
+
+        soup = None
         try:
+            if not fetched_ok:
+                raise Exception("Non-2XX response from publisher")
+
+            from newspaper import Article, Config
+
             config = Config()
             config.browser_user_agent = self.headers["User-Agent"]
-            config.follow_meta_refresh = True
+            config.follow_meta_refresh = False
             config.fetch_images = True
 
-            article = Article(url, config=config, language="en")
-            article.download()
-            article.parse()
+            with span("extraction.parse", html_bytes=len(html)) as parse_span:
+                article = Article(url, config=config, language="en")
+                article.download(input_html=html)
+                article.parse()
+                parse_span.set_attribute("text_chars", len(article.text or ""))
 
             author = "Unknown"
             if article.authors and len(article.authors) > 0:
@@ -47,7 +89,8 @@ class ArticleExtractor:
                     publish_date = str(article.publish_date)
 
             try:
-                article.nlp()
+                with span("extraction.nlp"):
+                    article.nlp()
                 summary = article.summary
                 keywords = article.keywords
             except:
@@ -58,7 +101,9 @@ class ArticleExtractor:
             images_list = list(article.images) if article.images else []
 
             if author == "Unknown" or publish_date == "Unknown":
-                meta_data = self._extract_metadata(url)
+                with span("extraction.metadata"):
+                    soup = BeautifulSoup(html, "html.parser")
+                    meta_data = self._extract_metadata(soup)
                 if author == "Unknown" and meta_data.get("author"):
                     author = meta_data["author"]
                 if publish_date == "Unknown" and meta_data.get("publish_date"):
@@ -79,13 +124,37 @@ class ArticleExtractor:
 
         except Exception as e:
             print(f"Newspaper3k extraction failed: {str(e)}")
-            return self._fallback_extraction(url)
-
-    def _extract_metadata(self, url: str) -> Dict:
+            FALLBACKS.inc(component="extraction", reason="newspaper")
+            with span("extraction.fallback"):
+                return self._fallback_extraction(url, html, soup)
+
+    def _fetch(self, url: str) -> Tuple[str, bool]:
+        with span("extraction.fetch") as fetch_span:
+            response = self._get(url)
+            html = response.text
+
+            refresh_match = META_REFRESH_PATTERN.search(html[:20000])
+            if refresh_match:
+                refresh_url = urljoin(response.url, refresh_match.group(1))
+                if refresh_url != response.url:
+                    fetch_span.set_attribute("meta_refresh", True)
+                    response = self._get(refresh_url)
+                    html = response.text
+
+            fetch_span.set_attributes(
+                status_code=response.status_code,
+                bytes_fetched=len(response.content),
+            )
+            return html, 200 <= response.status_code < 300
+
+    def _get(self, url: str) -> requests.Response:
+        response = self.session.get(url, timeout=10)
+        if not response.encoding or response.encoding.lower() == "iso-8859-1":
+            response.encoding = response.apparent_encoding
+        return response
+
+    def _extract_metadata(self, soup: BeautifulSoup) -> Dict:
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, "html.parser")
-
             metadata = {"author": None, "publish_date": None}
 
             author_selectors = [
@@ -178,15 +247,17 @@ class ArticleExtractor:
 
         return None
 
-    def _fallback_extraction(self, url: str) -> Dict:
+    def _fallback_extraction(
+        self, url: str, html: str, soup: Optional[BeautifulSoup] = None
+    ) -> Dict:
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            soup = BeautifulSoup(response.content, "html.parser")
+            if soup is None:
+                soup = BeautifulSoup(html, "html.parser")
 
             title = soup.find("title")
             title = title.get_text().strip() if title else "No title found"
 
-            metadata = self._extract_metadata(url)
+            metadata = self._extract_metadata(soup)
             author = metadata.get("author") or "Unknown"
             publish_date = metadata.get("publish_date") or "Unknown"
 
@@ -0,0 +1,92 @@
+from typing import Dict, Optional, Tuple
+
+from services.credibility_scorer import (
+    CREDIBILITY_INSTRUCTIONS,
+    CredibilityScorer,
+    article_details,
+    extract_domain,
+)
+from services.excerpt_selector import select_excerpt
+from services.fact_checker import (
+    CLAIM_INSTRUCTIONS,
+    failed_claims,
+    rate_limited_claims,
+    unparsed_claims,
+)
+from services.gemini_client import GeminiClient, GeminiSchemaError
+from services.llm_schemas import CombinedAnalysis
+from utils.cache import LLMResponseCache
+from utils.metrics import FALLBACKS
+from utils.rate_limiter import RateLimiterSaturated
+
+
+class CombinedAnalyzer:
+    def __init__(
+        self,
+        api_key: str,
+        credibility_scorer: CredibilityScorer,
+        response_cache: Optional[LLMResponseCache] = None,
+        gemini_client: Optional[GeminiClient] = None,
+    ):
+        self.client = gemini_client or GeminiClient(api_key, response_cache)
+        self.credibility_scorer = credibility_scorer
+
+    async def analyze(
+        self,
+        url: str,
+        title: str,
+        text: str,
+        author: str = "",
+        publish_date: str = "",
+        prior: Optional[Dict] = None,
+    ) -> Tuple[Dict, Dict]:
+        if prior is None:
+            prior = await self.credibility_scorer.heuristic_scorer.analyze_async(
+                url=url,
+                title=title,
+                text=text,
+                author=author,
+                publish_date=publish_date,
+            )
+
+        try:
+            domain = extract_domain(url)
+
+            text_sample = select_excerpt(text)
+
+            prompt = f"""
+Analyze this news article for credibility and for the factual claims it makes.
+
+{article_details(domain, title, author, publish_date, text_sample)}
+
+Part A - Credibility. {CREDIBILITY_INSTRUCTIONS}
+
+Part B - Claims.
+{CLAIM_INSTRUCTIONS}
+"""
+
+            analysis = await self.client.generate_json(prompt, CombinedAnalysis)
+            return (
+                self.credibility_scorer.build_result(
+                    domain, analysis["credibility"], prior
+                ),
+                analysis["fact_checks"],
+            )
+
+        except GeminiSchemaError:
+            FALLBACKS.inc(component="combined_analysis", reason="schema")
+            return (
+                self.credibility_scorer.parse_failure_result(prior),
+                unparsed_claims(),
+            )
+        except RateLimiterSaturated as e:
+            print(f"Combined analysis shed: {str(e)}")
+            FALLBACKS.inc(component="combined_analysis", reason="saturated")
+            return (
+                self.credibility_scorer.rate_limited_result(prior),
+                rate_limited_claims(),
+            )
+        except Exception as e:
+            print(f"Combined analysis error: {str(e)}")
+            FALLBACKS.inc(component="combined_analysis", reason="error")
+            return self.credibility_scorer.error_result(prior, e), failed_claims(e)
@@ -1,9 +1,45 @@
-import google.generativeai as genai
-from typing import Dict, List
-import json
+from typing import Dict, List, Optional
+import os
 from collections import Counter
 from urllib.parse import urlparse
 
+from services.domain_reputation import (
+    DomainReputationIndex,
+    load_default_index,
+    reputation_label,
+)
+from services.heuristic_scorer import HeuristicScorer
+from services.excerpt_selector import select_excerpt
+from services.gemini_client import GeminiClient, GeminiSchemaError
+from services.llm_schemas import CredibilityAnalysis
+from utils.cache import LLMResponseCache
+from utils.metrics import FALLBACKS
+from utils.rate_limiter import RateLimiterSaturated
+
+CREDIBILITY_INSTRUCTIONS = """Rate the following on a scale of 0-10:
+1. Source Reputation (based on domain)
+2. Writing Quality (grammar, professionalism)
+3. Evidence Quality (citations, sources mentioned)
+4. Objectivity (balanced vs biased language)
+5. Transparency (author info, date, clear sourcing)
+
+Also identify:
+- Bias direction (left, center, right, or neutral)
+- Sensationalism level (low, medium, high)
+- Key credibility concerns and strengths"""
+
+
+def article_details(
+    domain: str, title: str, author: str, publish_date: str, text_sample: str
+) -> str:
+    return f"""Domain: {domain}
+Title: {title}
+Author: {author}
+Published: {publish_date}
+
+Article excerpt:
+{text_sample}"""
+
 
 def extract_domain(url: str) -> str:
     try:
@@ -17,147 +53,143 @@ def extract_domain(url: str) -> str:
 
 
 class CredibilityScorer:
-    HIGH_CREDIBILITY_DOMAINS = [
-        "reuters.com",
-        "apnews.com",
-        "bbc.com",
-        "npr.org",
-        "theguardian.com",
-        "nytimes.com",
-        "washingtonpost.com",
-        "wsj.com",
-        "economist.com",
-        "nature.com",
-        "science.org",
-    ]
-
-    MEDIUM_CREDIBILITY_DOMAINS = [
-        "cnn.com",
-        "foxnews.com",
-        "msnbc.com",
-        "usatoday.com",
-        "time.com",
-        "newsweek.com",
-        "politico.com",
-    ]
-
-    def __init__(self, api_key: str):
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY is required")
-
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
+    def __init__(
+        self,
+        api_key: str,
+        response_cache: Optional[LLMResponseCache] = None,
+        reputation_index: Optional[DomainReputationIndex] = None,
+        heuristic_scorer: Optional[HeuristicScorer] = None,
+        gemini_client: Optional[GeminiClient] = None,
+    ):
+        self.client = gemini_client or GeminiClient(api_key, response_cache)
+        self.reputation_index = reputation_index or load_default_index()
+        self.heuristic_scorer = heuristic_scorer or HeuristicScorer(
+            self.reputation_index
+        )
+        self.prior_weight = float(os.getenv("HEURISTIC_PRIOR_WEIGHT", "0"))
 
     async def analyze(
-        self, url: str, title: str, text: str, author: str = "", publish_date: str = ""
+        self,
+        url: str,
+        title: str,
+        text: str,
+        author: str = "",
+        publish_date: str = "",
+        prior: Optional[Dict] = None,
     ) -> Dict:
+        if prior is None:
+            prior = await self.heuristic_scorer.analyze_async(
+                url=url,
+                title=title,
+                text=text,
+                author=author,
+                publish_date=publish_date,
+            )
+
         try:
             domain = extract_domain(url)
-            domain_score = self._get_domain_score(domain)
 
-            text_sample = text[:3000]
+            text_sample = select_excerpt(text)
 
             prompt = f"""
 Analyze the credibility of this news article:
 
-Domain: {domain}
-Title: {title}
-Author: {author}
-Published: {publish_date}
+{article_details(domain, title, author, publish_date, text_sample)}
 
-Article excerpt:
-{text_sample}
-
-Rate the following on a scale of 0-10:
-1. Source Reputation (based on domain)
-2. Writing Quality (grammar, professionalism)
-3. Evidence Quality (citations, sources mentioned)
-4. Objectivity (balanced vs biased language)
-5. Transparency (author info, date, clear sourcing)
-
-Also identify:
-- Bias direction (left, center, right, or neutral)
-- Sensationalism level (low, medium, high)
-- Key credibility concerns
-
-Return JSON format:
-{{
-    "scores": {{
-        "source_reputation": 0-10,
-        "writing_quality": 0-10,
-        "evidence_quality": 0-10,
-        "objectivity": 0-10,
-        "transparency": 0-10
-    }},
-    "bias": "left/center/right/neutral",
-    "sensationalism": "low/medium/high",
-    "concerns": ["concern 1", "concern 2"],
-    "strengths": ["strength 1", "strength 2"]
-}}
+{CREDIBILITY_INSTRUCTIONS}
 """
 
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-
-            try:
-                if "```json" in result_text:
-                    result_text = result_text.split("```json")[1].split("```")[0]
-                elif "```" in result_text:
-                    result_text = result_text.split("```")[1].split("```")[0]
-
-                analysis = json.loads(result_text.strip())
-                scores = analysis.get("scores", {})
-
-                score_values = [
-                    domain_score,
-                    scores.get("source_reputation", 5),
-                    scores.get("writing_quality", 5),
-                    scores.get("evidence_quality", 5),
-                    scores.get("objectivity", 5),
-                    scores.get("transparency", 5),
-                ]
-                overall_score = int((sum(score_values) / len(score_values)) * 10)
-
-                return {
-                    "overall_score": overall_score,
-                    "domain": domain,
-                    "domain_reputation": self._get_domain_reputation(domain),
-                    "detailed_scores": scores,
-                    "bias": analysis.get("bias", "unknown"),
-                    "sensationalism": analysis.get("sensationalism", "unknown"),
-                    "concerns": analysis.get("concerns", []),
-                    "strengths": analysis.get("strengths", []),
-                }
-
-            except json.JSONDecodeError:
-                return {
-                    "overall_score": domain_score * 10,
-                    "domain": domain,
-                    "domain_reputation": self._get_domain_reputation(domain),
-                    "detailed_scores": {},
-                    "bias": "unknown",
-                    "sensationalism": "unknown",
-                    "concerns": ["Could not complete full analysis"],
-                    "strengths": [],
-                }
+            analysis = await self.client.generate_json(prompt, CredibilityAnalysis)
+            return self.build_result(domain, analysis, prior)
 
+        except GeminiSchemaError:
+            FALLBACKS.inc(component="credibility", reason="schema")
+            return self.parse_failure_result(prior)
+        except RateLimiterSaturated as e:
+            print(f"Credibility analysis shed: {str(e)}")
+            FALLBACKS.inc(component="credibility", reason="saturated")
+            return self.rate_limited_result(prior)
         except Exception as e:
             print(f"Credibility analysis error: {str(e)}")
-            return {
-                "overall_score": 50,
-                "domain": url,
-                "domain_reputation": "Unknown",
-                "detailed_scores": {},
-                "bias": "unknown",
-                "sensationalism": "unknown",
-                "concerns": [f"Analysis error: {str(e)}"],
-                "strengths": [],
-            }
+            FALLBACKS.inc(component="credibility", reason="error")
+            return self.error_result(prior, e)
+
+    def build_result(
+        self, domain: str, analysis: Dict, prior: Optional[Dict] = None
+    ) -> Dict:
+        domain_score = self._get_domain_score(domain)
+        scores = analysis.get("scores", {})
+
+        score_values = [
+            domain_score,
+            scores.get("source_reputation", 5),
+            scores.get("writing_quality", 5),
+            scores.get("evidence_quality", 5),
+            scores.get("objectivity", 5),
+            scores.get("transparency", 5),
+        ]
+        overall_score = int((sum(score_values) / len(score_values)) * 10)
+        if prior is not None and self.prior_weight > 0:
+            overall_score = int(
+                overall_score * (1 - self.prior_weight)
+                + prior["overall_score"] * self.prior_weight
+            )
+
+        return {
+            "overall_score": overall_score,
+            "domain": domain,
+            "domain_reputation": self._get_domain_reputation(domain),
+            "source_bias": self._get_domain_bias(domain),
+            "detailed_scores": scores,
+            "bias": analysis.get("bias", "unknown"),
+            "sensationalism": analysis.get("sensationalism", "unknown"),
+            "concerns": analysis.get("concerns", []),
+            "strengths": analysis.get("strengths", []),
+            "analysis_source": "llm",
+        }
+
+    def fallback_result(
+        self, prior: Dict, concern: str, analysis_source: str = "heuristic"
+    ) -> Dict:
+        return {
+            **prior,
+            "concerns": [concern, *prior.get("concerns", [])],
+            "analysis_source": analysis_source,
+        }
+
+    def parse_failure_result(self, prior: Dict) -> Dict:
+        return self.fallback_result(prior, "Could not complete full analysis")
+
+    def rate_limited_result(self, prior: Dict) -> Dict:
+        return self.fallback_result(
+            prior,
+            "Analysis skipped: the AI model is at capacity, please retry later",
+            analysis_source="rate_limited",
+        )
+
+    def error_result(self, prior: Dict, error: Exception) -> Dict:
+        return self.fallback_result(prior, f"Analysis error: {str(error)}")
 
     def analyze_bias_distribution(self, articles: List[Dict]) -> Dict:
         sources = [article.get("source", "Unknown") for article in articles]
         source_counts = Counter(sources)
 
+        reputation_counts = Counter()
+        rated_scores = []
+        for article in articles:
+            score = self.reputation_index.lookup(extract_domain(article.get("url", "")))
+            if score is None:
+                reputation_counts["unrated"] += 1
+                continue
+
+            rated_scores.append(score)
+            if score >= 8:
+                reputation_counts["high"] += 1
+            elif score >= 6:
+                reputation_counts["medium"] += 1
+            else:
+                reputation_counts["low"] += 1
+
         return {
             "total_articles": len(articles),
             "unique_sources": len(source_counts),
@@ -165,21 +197,21 @@ Return JSON format:
             "diversity_score": (
                 min(len(source_counts) / len(articles) * 100, 100) if articles else 0
             ),
+            "reputation_distribution": dict(reputation_counts),
+            "average_source_score": (
+                round(sum(rated_scores) / len(rated_scores), 1)
+                if rated_scores
+                else None
+            ),
         }
 
     def _get_domain_score(self, domain: str) -> int:
-        if any(d in domain for d in self.HIGH_CREDIBILITY_DOMAINS):
-            return 9
-        elif any(d in domain for d in self.MEDIUM_CREDIBILITY_DOMAINS):
-            return 7
-        else:
-            return 5
+        score = self.reputation_index.lookup(domain)
+        return score if score is not None else 5
+
+    def _get_domain_bias(self, domain: str) -> str:
+        rating = self.reputation_index.lookup_rating(domain)
+        return rating.bias if rating is not None and rating.bias else "unknown"
 
     def _get_domain_reputation(self, domain: str) -> str:
-        score = self._get_domain_score(domain)
-        if score >= 8:
-            return "High Credibility"
-        elif score >= 6:
-            return "Medium Credibility"
-        else:
-            return ""
+        return reputation_label(self._get_domain_score(domain))
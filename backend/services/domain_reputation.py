@@ -0,0 +1,267 @@
+import argparse
+import csv
+import mmap
+import os
+import struct
+import threading
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import tldextract
+
+DATA_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"
+)
+DEFAULT_REPUTATION_FILE = os.path.join(DATA_DIR, "domain_reputation.csv")
+
+BIAS_LABELS = ["", "left", "lean-left", "center", "lean-right", "right", "mixed"]
+
+# Compact table layout: header, fixed-width records sorted by domain, then
+# the concatenated domain strings that the records point into.
+DB_MAGIC = b"VDRB"
+DB_VERSION = 1
+DB_HEADER = struct.Struct("<4sHI")
+DB_RECORD = struct.Struct("<IHBBI")
+
+# Bundled public suffix snapshot only; never fetch the list at runtime.
+_suffix_extractor = tldextract.TLDExtract(suffix_list_urls=(), cache_dir=None)
+
+
+class DomainRating(NamedTuple):
+    score: int
+    bias: str
+    updated_at: int
+
+
+def normalize_host(domain: str) -> str:
+    host = domain.strip().lower().rstrip(".")
+    if "://" in host:
+        host = host.split("://", 1)[1]
+    host = host.split("/", 1)[0].split(":", 1)[0]
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+
+@lru_cache(maxsize=65536)
+def registrable_domain(domain: str) -> str:
+    host = normalize_host(domain)
+    parts = _suffix_extractor(host)
+    if not parts.domain or not parts.suffix:
+        return host
+    return f"{parts.domain}.{parts.suffix}"
+
+
+def candidate_hosts(domain: str) -> Iterator[str]:
+    host = normalize_host(domain)
+    registrable = registrable_domain(host)
+
+    # Walk from the full host up to the registrable domain, so a rated
+    # subdomain wins but "reuters.com.evil.io" never matches "reuters.com".
+    while True:
+        yield host
+        if host == registrable or "." not in host:
+            return
+        host = host.split(".", 1)[1]
+
+
+def reputation_label(score: int) -> str:
+    if score >= 8:
+        return "High Credibility"
+    elif score >= 6:
+        return "Medium Credibility"
+    else:
+        return ""
+
+
+def _parse_timestamp(value: str) -> int:
+    if not value:
+        return 0
+    try:
+        return int(float(value))
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp())
+
+
+def read_ratings_csv(path: str) -> Dict[str, DomainRating]:
+    ratings = {}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            if not row.get("domain") or not row.get("score"):
+                continue
+            bias = (row.get("bias") or "").strip().lower()
+            ratings[normalize_host(row["domain"])] = DomainRating(
+                score=int(float(row["score"])),
+                bias=bias if bias in BIAS_LABELS else "",
+                updated_at=_parse_timestamp((row.get("updated_at") or "").strip()),
+            )
+    return ratings
+
+
+class DomainReputationIndex:
+    def __init__(self, ratings: Dict[str, DomainRating]):
+        self.ratings = ratings
+        self.lookup_rating = lru_cache(maxsize=65536)(self._lookup_rating)
+
+    @classmethod
+    def from_file(cls, path: str) -> "DomainReputationIndex":
+        return cls(read_ratings_csv(path))
+
+    def _lookup_rating(self, domain: str) -> Optional[DomainRating]:
+        for host in candidate_hosts(domain):
+            rating = self.ratings.get(host)
+            if rating is not None:
+                return rating
+        return None
+
+    def lookup(self, domain: str) -> Optional[int]:
+        rating = self.lookup_rating(domain)
+        return rating.score if rating is not None else None
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+
+class CompactReputationStore:
+    def __init__(self, path: str, reload_interval: float = 5.0):
+        self.path = path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._table: Tuple[Optional[mmap.mmap], int] = (None, 0)
+        self._mtime_ns = 0
+        self._checked_at = time.monotonic()
+        self._cached_rating = lru_cache(maxsize=65536)(self._lookup_rating)
+        self._open()
+
+    def _open(self) -> None:
+        with open(self.path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            mtime_ns = os.fstat(f.fileno()).st_mtime_ns
+
+        magic, version, count = DB_HEADER.unpack_from(mapped, 0)
+        if magic != DB_MAGIC or version != DB_VERSION:
+            mapped.close()
+            raise ValueError(f"{self.path} is not a domain reputation database")
+
+        # The previous map is left to the garbage collector so lookups that
+        # are still reading it on other threads finish safely.
+        self._table = (mapped, count)
+        self._mtime_ns = mtime_ns
+        self._cached_rating.cache_clear()
+
+    def _reload_if_changed(self) -> None:
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return
+
+        if mtime_ns != self._mtime_ns:
+            with self._lock:
+                if mtime_ns != self._mtime_ns:
+                    print(f"Reloading domain reputation database: {self.path}")
+                    try:
+                        self._open()
+                    except (OSError, ValueError) as e:
+                        print(f"Domain reputation reload failed: {str(e)}")
+                        self._mtime_ns = mtime_ns
+
+    def _find(self, host: str) -> Optional[DomainRating]:
+        mapped, count = self._table
+        key = host.encode("utf-8")
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            offset, length, score, bias, updated_at = DB_RECORD.unpack_from(
+                mapped, DB_HEADER.size + middle * DB_RECORD.size
+            )
+            domain = mapped[offset : offset + length]
+            if domain < key:
+                low = middle + 1
+            elif domain > key:
+                high = middle
+            else:
+                return DomainRating(score, BIAS_LABELS[bias], updated_at)
+        return None
+
+    def _lookup_rating(self, domain: str) -> Optional[DomainRating]:
+        for host in candidate_hosts(domain):
+            rating = self._find(host)
+            if rating is not None:
+                return rating
+        return None
+
+    def lookup_rating(self, domain: str) -> Optional[DomainRating]:
+        self._reload_if_changed()
+        return self._cached_rating(domain)
+
+    def lookup(self, domain: str) -> Optional[int]:
+        rating = self.lookup_rating(domain)
+        return rating.score if rating is not None else None
+
+    def __len__(self) -> int:
+        return self._table[1]
+
+
+def write_compact_db(ratings: Dict[str, DomainRating], path: str) -> None:
+    domains: List[bytes] = sorted(domain.encode("utf-8") for domain in ratings)
+    blob_offset = DB_HEADER.size + len(domains) * DB_RECORD.size
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(DB_HEADER.pack(DB_MAGIC, DB_VERSION, len(domains)))
+        offset = blob_offset
+        for domain in domains:
+            rating = ratings[domain.decode("utf-8")]
+            f.write(
+                DB_RECORD.pack(
+                    offset,
+                    len(domain),
+                    max(0, min(rating.score, 10)),
+                    BIAS_LABELS.index(rating.bias),
+                    rating.updated_at,
+                )
+            )
+            offset += len(domain)
+        for domain in domains:
+            f.write(domain)
+
+    # Atomic swap so running workers never map a half-written file.
+    os.replace(tmp_path, path)
+
+
+@lru_cache(maxsize=1)
+def load_default_index():
+    db_path = os.getenv("DOMAIN_REPUTATION_DB")
+    if db_path:
+        return CompactReputationStore(
+            db_path,
+            reload_interval=float(os.getenv("DOMAIN_REPUTATION_RELOAD_INTERVAL", "5")),
+        )
+
+    path = os.getenv("DOMAIN_REPUTATION_FILE", DEFAULT_REPUTATION_FILE)
+    return DomainReputationIndex.from_file(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build a compact domain reputation database from a CSV file "
+        "with domain,score[,bias,updated_at] columns."
+    )
+    parser.add_argument("csv_path")
+    parser.add_argument("db_path")
+    args = parser.parse_args()
+
+    started_at = time.perf_counter()
+    ratings = read_ratings_csv(args.csv_path)
+    write_compact_db(ratings, args.db_path)
+    print(
+        f"Wrote {len(ratings)} domains to {args.db_path} "
+        f"in {time.perf_counter() - started_at:.2f}s"
+    )
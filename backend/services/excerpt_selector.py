@@ -0,0 +1,106 @@
+import os
+import re
+from typing import List, Tuple
+
+from services.heuristic_scorer import WORD_FEATURES
+from utils.rate_limiter import estimate_tokens
+
+EXCERPT_TOKEN_BUDGET = int(os.getenv("EXCERPT_TOKEN_BUDGET", "750"))
+
+SENTENCE_PATTERN = re.compile(
+    r"(?:[^\n.!?]|[.!?](?=[^\s.!?\"”’)]))*(?:[.!?]+[\"”’)]*|\n|$)"
+)
+WORD_PATTERN = re.compile(r"\w[\w'’-]*|[\"“”]")
+
+ATTRIBUTION_WORDS = WORD_FEATURES["attribution"] | {
+    "according",
+    "estimated",
+    "found",
+    "shows",
+    "showed",
+    "warned",
+    "claimed",
+    "claims",
+    "added",
+}
+BOILERPLATE_WORDS = {
+    "subscribe",
+    "newsletter",
+    "cookie",
+    "cookies",
+    "advertisement",
+    "sign",
+    "login",
+    "share",
+    "copyright",
+    "rights",
+    "reserved",
+}
+MIN_SENTENCE_WORDS = 5
+
+
+def split_sentences(text: str) -> List[str]:
+    return [
+        sentence.strip()
+        for sentence in SENTENCE_PATTERN.findall(text)
+        if sentence.strip()
+    ]
+
+
+def score_sentence(sentence: str) -> float:
+    words = WORD_PATTERN.findall(sentence)
+    if len(words) < MIN_SENTENCE_WORDS:
+        return 0.0
+
+    score = 0.0
+    has_number = has_attribution = has_quote = False
+    entities = boilerplate = 0
+
+    for index, word in enumerate(words):
+        first = word[0]
+        if first in '"“”':
+            has_quote = True
+        elif first.isdigit():
+            has_number = True
+        else:
+            lower = word.lower()
+            if lower in ATTRIBUTION_WORDS:
+                has_attribution = True
+            elif lower in BOILERPLATE_WORDS:
+                boilerplate += 1
+            if index and first.isupper():
+                entities += 1
+
+    score += 2.0 if has_number else 0.0
+    score += 1.5 if has_attribution else 0.0
+    score += 1.5 if has_quote else 0.0
+    score += 0.5 * min(entities, 4)
+    score -= 2.0 * boilerplate
+    return score
+
+
+def select_excerpt(text: str, max_tokens: int = EXCERPT_TOKEN_BUDGET) -> str:
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = split_sentences(text)
+    ranked: List[Tuple[float, int]] = []
+    for position, sentence in enumerate(sentences):
+        score = score_sentence(sentence)
+        if score <= 0 and position:
+            continue
+        ranked.append((score + (1.0 if position < 3 else 0.0), position))
+    ranked.sort(key=lambda item: (-item[0], item[1]))
+
+    chosen = []
+    remaining = max_tokens
+    for _, position in ranked:
+        cost = estimate_tokens(sentences[position])
+        if cost <= remaining:
+            chosen.append(position)
+            remaining -= cost
+
+    if not chosen:
+        return text[: max_tokens * 4]
+
+    return " ".join(sentences[position] for position in sorted(chosen))
@@ -1,19 +1,49 @@
-import google.generativeai as genai
-from typing import Dict, List
-import json
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
+from services.excerpt_selector import select_excerpt
+from services.gemini_client import GeminiClient, GeminiSchemaError
+from services.llm_schemas import MAX_CLAIMS, FactCheckAnalysis, NeutralSummary
+from utils.cache import LLMResponseCache
+from utils.metrics import FALLBACKS
+from utils.rate_limiter import RateLimiterSaturated
+
+CLAIM_INSTRUCTIONS = f"""1. Identify up to {MAX_CLAIMS} main factual claims made in the text.
+2. For each claim, determine its verifiability (e.g., "Verifiable", "Partially Verifiable", "Difficult to Verify").
+3. Provide brief reasoning for your verifiability assessment.
+4. Identify any potential manipulation tactics used (e.g., "Emotional Language", "Misleading Statistics", "Appeal to Authority")."""
+
+
+def claims_fallback(message: str, **fields) -> Dict:
+    return {"claims": [], "manipulation_tactics": [message], **fields}
+
+
+def unparsed_claims() -> Dict:
+    return claims_fallback("Failed to parse AI model response")
+
+
+def rate_limited_claims() -> Dict:
+    return claims_fallback(
+        "Claim analysis skipped: the AI model is at capacity, please retry later",
+        analysis_source="rate_limited",
+    )
 
-class FactChecker:
-    def __init__(self, api_key: str):
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY is required")
 
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-2.5-flash")
+def failed_claims(error: Exception) -> Dict:
+    return claims_fallback(f"An error occurred: {str(error)}")
+
+
+class FactChecker:
+    def __init__(
+        self,
+        api_key: str,
+        response_cache: Optional[LLMResponseCache] = None,
+        gemini_client: Optional[GeminiClient] = None,
+    ):
+        self.client = gemini_client or GeminiClient(api_key, response_cache)
 
     async def check_claims(self, text: str, title: str = "") -> Dict:
         try:
-            text_sample = text[:3000]
+            text_sample = select_excerpt(text)
 
             prompt = f"""
 Analyze the following news article excerpt to identify key factual claims and assess their verifiability.
@@ -22,46 +52,21 @@ Title: {title}
 Article Text:
 {text_sample}
 
-1. Identify up to 5 main factual claims made in the text.
-2. For each claim, determine its verifiability (e.g., "Verifiable", "Partially Verifiable", "Difficult to Verify").
-3. Provide brief reasoning for your verifiability assessment.
-4. Identify any potential manipulation tactics used (e.g., "Emotional Language", "Misleading Statistics", "Appeal to Authority").
-
-Return the result in a clean JSON format:
-{{
-    "claims": [
-        {{
-            "claim": "The specific claim made in the article.",
-            "verifiability": "Verifiable/Partially Verifiable/Difficult to Verify",
-            "reasoning": "Brief explanation of why."
-        }}
-    ],
-    "manipulation_tactics": ["tactic 1", "tactic 2"]
-}}
+{CLAIM_INSTRUCTIONS}
 """
-            response = self.model.generate_content(prompt)
-            result_text = response.text
-
-            try:
-                if "```json" in result_text:
-                    result_text = result_text.split("```json")[1].split("```")[0]
-                elif "```" in result_text:
-                    result_text = result_text.split("```")[1].split("```")[0]
-
-                return json.loads(result_text.strip())
-
-            except (json.JSONDecodeError, IndexError):
-                return {
-                    "claims": [],
-                    "manipulation_tactics": ["Failed to parse AI model response"],
-                }
-
+            return await self.client.generate_json(prompt, FactCheckAnalysis)
+
+        except GeminiSchemaError:
+            FALLBACKS.inc(component="fact_checks", reason="schema")
+            return unparsed_claims()
+        except RateLimiterSaturated as e:
+            print(f"Claim verification shed: {str(e)}")
+            FALLBACKS.inc(component="fact_checks", reason="saturated")
+            return rate_limited_claims()
         except Exception as e:
             print(f"Claim verification error: {str(e)}")
-            return {
-                "claims": [],
-                "manipulation_tactics": [f"An error occurred: {str(e)}"],
-            }
+            FALLBACKS.inc(component="fact_checks", reason="error")
+            return failed_claims(e)
 
     async def generate_neutral_summary(self, articles: List[Dict], query: str) -> Dict:
         try:
@@ -72,15 +77,64 @@ Return the result in a clean JSON format:
                     "points_of_disagreement": [],
                 }
 
-            article_summaries = "\n\n".join(
-                [
-                    f"Source: {a.get('source', 'Unknown')}\nTitle: {a.get('title', '')}\n"
-                    f"Summary: {a.get('description', '')}"
-                    for a in articles[:5]
-                ]
-            )
+            prompt = self._neutral_summary_prompt(articles, query)
+            return await self.client.generate_json(prompt, NeutralSummary)
 
-            prompt = f"""
+        except GeminiSchemaError:
+            FALLBACKS.inc(component="neutral_summary", reason="schema")
+            return self._summary_parse_failure()
+        except RateLimiterSaturated as e:
+            print(f"Neutral summary shed: {str(e)}")
+            FALLBACKS.inc(component="neutral_summary", reason="saturated")
+            return self._summary_rate_limited()
+        except Exception as e:
+            print(f"Neutral summary error: {str(e)}")
+            FALLBACKS.inc(component="neutral_summary", reason="error")
+            return self._summary_error(e)
+
+    async def stream_neutral_summary(
+        self, articles: List[Dict], query: str
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        if not articles:
+            yield "consensus_summary", "Not enough articles to generate a summary."
+            yield "points_of_agreement", []
+            yield "points_of_disagreement", []
+            return
+
+        sent = set()
+        try:
+            prompt = self._neutral_summary_prompt(articles, query)
+            async for field, value in self.client.stream_json(prompt, NeutralSummary):
+                sent.add(field)
+                yield field, value
+            return
+
+        except GeminiSchemaError:
+            FALLBACKS.inc(component="neutral_summary", reason="schema")
+            fallback = self._summary_parse_failure()
+        except RateLimiterSaturated as e:
+            print(f"Neutral summary shed: {str(e)}")
+            FALLBACKS.inc(component="neutral_summary", reason="saturated")
+            fallback = self._summary_rate_limited()
+        except Exception as e:
+            print(f"Neutral summary error: {str(e)}")
+            FALLBACKS.inc(component="neutral_summary", reason="error")
+            fallback = self._summary_error(e)
+
+        for field, value in fallback.items():
+            if field not in sent:
+                yield field, value
+
+    def _neutral_summary_prompt(self, articles: List[Dict], query: str) -> str:
+        article_summaries = "\n\n".join(
+            [
+                f"Source: {a.get('source', 'Unknown')}\nTitle: {a.get('title', '')}\n"
+                f"Summary: {a.get('description', '')}"
+                for a in articles[:5]
+            ]
+        )
+
+        return f"""
 Analyze the following article summaries on the topic of "{query}".
 
 Summaries:
@@ -91,39 +145,29 @@ Based on these summaries:
 2. List the main points of agreement across the different sources.
 3. List the main points of disagreement or different perspectives.
 4. Provide a media literacy tip relevant to the topic.
-
-Return the result in a clean JSON format:
-{{
-    "consensus_summary": "Your neutral summary here.",
-    "points_of_agreement": ["Point 1", "Point 2"],
-    "points_of_disagreement": ["Point A", "Point B"],
-    "media_literacy_tip": "Your tip here."
-}}
 """
-            response = self.model.generate_content(prompt)
-            result_text = response.text
 
-            try:
-                if "```json" in result_text:
-                    result_text = result_text.split("```json")[1].split("```")[0]
-                elif "```" in result_text:
-                    result_text = result_text.split("```")[1].split("```")[0]
-
-                return json.loads(result_text.strip())
-
-            except (json.JSONDecodeError, IndexError):
-                return {
-                    "consensus_summary": "Could not parse the generated summary.",
-                    "points_of_agreement": [],
-                    "points_of_disagreement": [],
-                    "media_literacy_tip": "Always be critical of sources.",
-                }
-
-        except Exception as e:
-            print(f"Neutral summary error: {str(e)}")
-            return {
-                "consensus_summary": f"An error occurred: {str(e)}",
-                "points_of_agreement": [],
-                "points_of_disagreement": [],
-                "media_literacy_tip": "Check for errors in your tools.",
-            }
+    def _summary_parse_failure(self) -> Dict:
+        return {
+            "consensus_summary": "Could not parse the generated summary.",
+            "points_of_agreement": [],
+            "points_of_disagreement": [],
+            "media_literacy_tip": "Always be critical of sources.",
+        }
+
+    def _summary_rate_limited(self) -> Dict:
+        return {
+            "consensus_summary": "Summary skipped: the AI model is at capacity, please retry later.",
+            "points_of_agreement": [],
+            "points_of_disagreement": [],
+            "media_literacy_tip": "Always be critical of sources.",
+            "analysis_source": "rate_limited",
+        }
+
+    def _summary_error(self, error: Exception) -> Dict:
+        return {
+            "consensus_summary": f"An error occurred: {str(error)}",
+            "points_of_agreement": [],
+            "points_of_disagreement": [],
+            "media_literacy_tip": "Check for errors in your tools.",
+        }
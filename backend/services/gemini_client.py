@@ -0,0 +1,277 @@
+from pydantic import BaseModel, ValidationError
+from contextlib import contextmanager
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple, Type
+import asyncio
+import importlib
+import os
+
+from utils.cache import LLMResponseCache
+from utils.concurrency import run_blocking
+from utils.json_stream import JSONFieldStream
+from utils.metrics import UPSTREAM_DURATION, UPSTREAM_ERRORS, UPSTREAM_IN_FLIGHT
+from utils.tracing import span, tracer
+from utils.rate_limiter import get_limiter, estimate_tokens
+
+GEMINI_MODEL = "gemini-2.5-flash"
+SCHEMA_RETRIES = int(os.getenv("GEMINI_SCHEMA_RETRIES", "1"))
+KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "30"))
+
+RESPONSE_SCHEMA_KEYS = {
+    "type",
+    "format",
+    "description",
+    "nullable",
+    "enum",
+    "items",
+    "properties",
+    "required",
+}
+
+
+class GeminiSchemaError(Exception):
+    pass
+
+
+def response_schema(model: Type[BaseModel]) -> Dict[str, Any]:
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        if "$ref" in node:
+            node = definitions[node["$ref"].rsplit("/", 1)[-1]]
+
+        converted = {
+            key: value for key, value in node.items() if key in RESPONSE_SCHEMA_KEYS
+        }
+        if "items" in converted:
+            converted["items"] = convert(converted["items"])
+        if "properties" in converted:
+            converted["properties"] = {
+                name: convert(prop) for name, prop in converted["properties"].items()
+            }
+        return converted
+
+    return convert(schema)
+
+
+def proto_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    converted = dict(schema)
+    if "type" in converted:
+        converted["type_"] = converted.pop("type").upper()
+    if "format" in converted:
+        converted["format_"] = converted.pop("format")
+    if "items" in converted:
+        converted["items"] = proto_schema(converted["items"])
+    if "properties" in converted:
+        converted["properties"] = {
+            name: proto_schema(prop) for name, prop in converted["properties"].items()
+        }
+    return converted
+
+
+def response_text(response: Any, strict: bool = True) -> str:
+    if not response.candidates:
+        if strict:
+            raise ValueError(
+                f"Gemini returned no candidates: {response.prompt_feedback}"
+            )
+        return ""
+    return "".join(part.text for part in response.candidates[0].content.parts)
+
+
+class GeminiClient:
+    def __init__(
+        self,
+        api_key: str,
+        response_cache: Optional[LLMResponseCache] = None,
+        model_name: str = GEMINI_MODEL,
+        schema_retries: int = SCHEMA_RETRIES,
+        keepalive_seconds: float = KEEPALIVE_SECONDS,
+    ):
+        if not api_key:
+            raise ValueError("GEMINI_API_KEY is required")
+
+        self.api_key = api_key
+        self.model_name = model_name
+        self.keepalive_seconds = keepalive_seconds
+        self._channel = None
+        self._client = None
+        self._glm = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self.response_cache = response_cache
+        self.rate_limiter = get_limiter("GEMINI")
+        self.schema_retries = schema_retries
+        self._generation_configs: Dict[Type[BaseModel], Any] = {}
+
+    async def start(self) -> None:
+        if self._client is not None and self._glm is not None:
+            return
+
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            # Importing the SDK takes hundreds of milliseconds; keep it off the loop.
+            if self._glm is None:
+                self._glm = await run_blocking(
+                    importlib.import_module, "google.ai.generativelanguage_v1beta"
+                )
+            if self._client is None:
+                self._open_channel()
+
+    def _open_channel(self) -> None:
+        from google.ai.generativelanguage_v1beta.services.generative_service.transports import (
+            GenerativeServiceGrpcAsyncIOTransport,
+        )
+        from google.auth import api_key as api_key_credentials
+
+        keepalive_ms = int(self.keepalive_seconds * 1000)
+        self._channel = GenerativeServiceGrpcAsyncIOTransport.create_channel(
+            credentials=api_key_credentials.Credentials(self.api_key),
+            options=[
+                ("grpc.max_send_message_length", -1),
+                ("grpc.max_receive_message_length", -1),
+                ("grpc.keepalive_time_ms", keepalive_ms),
+                ("grpc.keepalive_timeout_ms", min(keepalive_ms, 10000)),
+                ("grpc.keepalive_permit_without_calls", 1),
+                ("grpc.http2.max_pings_without_data", 0),
+            ],
+        )
+        self._client = self._glm.GenerativeServiceAsyncClient(
+            transport=GenerativeServiceGrpcAsyncIOTransport(channel=self._channel)
+        )
+
+    async def warm_up(self, timeout: float) -> None:
+        await self.start()
+        await asyncio.wait_for(self._channel.channel_ready(), timeout=timeout)
+
+    async def close(self) -> None:
+        if self._channel is None:
+            return
+
+        await self._channel.close()
+        self._channel = None
+        self._client = None
+
+    async def generate_json(self, prompt: str, schema: Type[BaseModel]) -> Dict:
+        cache_namespace = f"{self.model_name}:{schema.__name__}"
+        if self.response_cache is not None:
+            cached = await self.response_cache.get_async(cache_namespace, prompt)
+            if cached is not None:
+                return cached
+
+        await self.start()
+        request = self._request(prompt, schema)
+        for attempt in range(self.schema_retries + 1):
+            with span(
+                "gemini.generate",
+                operation=schema.__name__,
+                attempt=attempt + 1,
+                prompt_chars=len(prompt),
+            ) as call_span:
+                async with self.rate_limiter.acquire(tokens=estimate_tokens(prompt)):
+                    with self._track_call(schema.__name__):
+                        response = await self._client.generate_content(request)
+
+                text = response_text(response)
+                try:
+                    result = schema.model_validate_json(text).model_dump()
+                    call_span.set_attributes(
+                        response_chars=len(text), parse_success=True
+                    )
+                except ValidationError as e:
+                    call_span.set_attributes(
+                        response_chars=len(text), parse_success=False
+                    )
+                    UPSTREAM_ERRORS.inc(
+                        upstream="gemini", operation=schema.__name__, reason="schema"
+                    )
+                    print(
+                        f"Gemini {schema.__name__} response failed validation "
+                        f"(attempt {attempt + 1}): {str(e)}"
+                    )
+                    continue
+
+            if self.response_cache is not None:
+                await self.response_cache.set_async(cache_namespace, prompt, result)
+            return result
+
+        raise GeminiSchemaError(
+            f"Gemini response did not match {schema.__name__} after "
+            f"{self.schema_retries + 1} attempts"
+        )
+
+    async def stream_json(
+        self, prompt: str, schema: Type[BaseModel]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        cache_namespace = f"{self.model_name}:{schema.__name__}"
+        if self.response_cache is not None:
+            cached = await self.response_cache.get_async(cache_namespace, prompt)
+            if cached is not None:
+                for field in cached.items():
+                    yield field
+                return
+
+        await self.start()
+        request = self._request(prompt, schema)
+        parser = JSONFieldStream()
+        # Spans cannot be activated across yields, so this one is closed by hand.
+        stream_span = tracer.start_span(
+            "gemini.stream", operation=schema.__name__, prompt_chars=len(prompt)
+        )
+        error = None
+        try:
+            async with self.rate_limiter.acquire(tokens=estimate_tokens(prompt)):
+                with self._track_call(f"{schema.__name__}.stream"):
+                    response = await self._client.stream_generate_content(request)
+                    async for chunk in response:
+                        for field in parser.feed(response_text(chunk, strict=False)):
+                            yield field
+
+            try:
+                result = schema.model_validate_json(parser.buffer).model_dump()
+            except ValidationError as e:
+                UPSTREAM_ERRORS.inc(
+                    upstream="gemini",
+                    operation=f"{schema.__name__}.stream",
+                    reason="schema",
+                )
+                raise GeminiSchemaError(
+                    f"Streamed Gemini response did not match {schema.__name__}: {str(e)}"
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            stream_span.set_attributes(
+                response_chars=len(parser.buffer), parse_success=error is None
+            )
+            tracer.end_span(stream_span, error)
+
+        if self.response_cache is not None:
+            await self.response_cache.set_async(cache_namespace, prompt, result)
+
+    @contextmanager
+    def _track_call(self, operation: str) -> Iterator[None]:
+        try:
+            with UPSTREAM_IN_FLIGHT.track_inprogress(
+                upstream="gemini"
+            ), UPSTREAM_DURATION.time(upstream="gemini", operation=operation):
+                yield
+        except Exception as e:
+            UPSTREAM_ERRORS.inc(
+                upstream="gemini", operation=operation, reason=type(e).__name__
+            )
+            raise
+
+    def _request(self, prompt: str, schema: Type[BaseModel]) -> Any:
+        glm = self._glm
+        if schema not in self._generation_configs:
+            self._generation_configs[schema] = glm.GenerationConfig(
+                response_mime_type="application/json",
+                response_schema=glm.Schema(proto_schema(response_schema(schema))),
+            )
+        return glm.GenerateContentRequest(
+            model=f"models/{self.model_name}",
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+            generation_config=self._generation_configs[schema],
+        )
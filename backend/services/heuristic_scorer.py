@@ -0,0 +1,252 @@
+import os
+import re
+from typing import Dict, List
+
+from services.domain_reputation import load_default_index, reputation_label
+from utils.concurrency import run_blocking
+from utils.helpers import extract_domain
+
+# Scoring is linear in text length; longer articles are scored in a worker
+# thread so they don't stall the event loop.
+INLINE_TEXT_CHARS = 20000
+
+TOKEN_PATTERN = re.compile(
+    r"https?://\S+|www\.\S+|\[\d+\]|\(\d{4}\)|\w[\w'’-]*|[\"“”!]|[.?](?=\s|$)"
+)
+
+WORD_FEATURES = {
+    "attribution": {
+        "said",
+        "says",
+        "told",
+        "reported",
+        "stated",
+        "announced",
+        "confirmed",
+        "spokesman",
+        "spokeswoman",
+        "spokesperson",
+    },
+    "citation": {"study", "survey", "report", "research", "researchers"},
+    "hedge": {
+        "reportedly",
+        "allegedly",
+        "might",
+        "possibly",
+        "perhaps",
+        "unconfirmed",
+        "unclear",
+        "rumored",
+        "rumoured",
+    },
+    "sensational": {
+        "shocking",
+        "outrage",
+        "outrageous",
+        "unbelievable",
+        "bombshell",
+        "destroys",
+        "destroyed",
+        "slam",
+        "slams",
+        "miracle",
+        "exposed",
+        "jaw-dropping",
+        "insane",
+        "horrifying",
+        "explosive",
+        "mind-blowing",
+        "terrifying",
+        "scandal",
+        "epic",
+        "furious",
+    },
+}
+PHRASE_FEATURES = {
+    ("according", "to"): "attribution",
+    ("published", "in"): "citation",
+    ("data", "from"): "citation",
+    ("et", "al"): "citation",
+    ("appears", "to"): "hedge",
+    ("appear", "to"): "hedge",
+    ("sources", "say"): "hedge",
+    ("must", "see"): "sensational",
+    ("won't", "believe"): "sensational",
+    ("won’t", "believe"): "sensational",
+}
+WORD_LOOKUP = {
+    word: feature for feature, words in WORD_FEATURES.items() for word in words
+}
+FEATURE_NAMES = (
+    "words",
+    "sentences",
+    "quote",
+    "exclamation",
+    "link",
+    "number",
+    "caps",
+    *WORD_FEATURES,
+)
+
+AUTO_TIER_HIGH_SCORE = int(os.getenv("AUTO_TIER_HIGH_SCORE", "75"))
+AUTO_TIER_LOW_SCORE = int(os.getenv("AUTO_TIER_LOW_SCORE", "35"))
+
+
+def extract_features(text: str, title: str = "") -> Dict[str, int]:
+    counts = dict.fromkeys(FEATURE_NAMES, 0)
+    previous = ""
+
+    for match in TOKEN_PATTERN.finditer(f"{title}\n{text}"):
+        token = match.group()
+        first = token[0]
+
+        if first == "!":
+            counts["exclamation"] += 1
+            counts["sentences"] += 1
+        elif first in ".?":
+            counts["sentences"] += 1
+        elif first in '"“”':
+            counts["quote"] += 1
+        elif first in "[(":
+            counts["citation"] += 1
+        elif "://" in token or token.startswith("www."):
+            counts["link"] += 1
+        else:
+            counts["words"] += 1
+            if first.isdigit():
+                counts["number"] += 1
+                previous = ""
+                continue
+            if len(token) >= 4 and token.isupper():
+                counts["caps"] += 1
+
+            word = token.lower()
+            feature = PHRASE_FEATURES.get((previous, word)) or WORD_LOOKUP.get(word)
+            if feature is not None:
+                counts[feature] += 1
+            previous = word
+            continue
+
+        previous = ""
+
+    counts["words"] = max(counts["words"], 1)
+    counts["sentences"] = max(counts["sentences"], 1)
+    return counts
+
+
+def _clamp(value: float) -> int:
+    return int(max(0, min(10, round(value))))
+
+
+class HeuristicScorer:
+    def __init__(self, reputation_index=None):
+        self.reputation_index = reputation_index or load_default_index()
+
+    async def analyze_async(
+        self, url: str, title: str, text: str, author: str = "", publish_date: str = ""
+    ) -> Dict:
+        if len(text) <= INLINE_TEXT_CHARS:
+            return self.analyze(url, title, text, author, publish_date)
+        return await run_blocking(self.analyze, url, title, text, author, publish_date)
+
+    def analyze(
+        self, url: str, title: str, text: str, author: str = "", publish_date: str = ""
+    ) -> Dict:
+        domain = extract_domain(url)
+        rating = self.reputation_index.lookup_rating(domain)
+        domain_score = rating.score if rating is not None else 5
+
+        features = extract_features(text, title)
+        words = features["words"]
+        per_100_words = 100 / words
+
+        has_author = bool(author) and author != "Unknown"
+        has_date = bool(publish_date) and publish_date != "Unknown"
+
+        quotes = features["quote"] // 2
+        attribution_rate = (features["attribution"] + quotes) * per_100_words
+        citation_rate = (features["citation"] + features["link"]) * per_100_words
+        hedge_rate = features["hedge"] * per_100_words
+        sensational_rate = features["sensational"] * per_100_words
+        caps_ratio = features["caps"] / words
+        exclamation_ratio = features["exclamation"] / features["sentences"]
+        words_per_sentence = words / features["sentences"]
+
+        scores = {
+            "source_reputation": domain_score,
+            "writing_quality": _clamp(
+                9
+                - exclamation_ratio * 20
+                - caps_ratio * 100
+                - (2 if words_per_sentence < 8 or words_per_sentence > 40 else 0)
+            ),
+            "evidence_quality": _clamp(
+                2 + attribution_rate * 3 + citation_rate * 4 - hedge_rate * 2
+            ),
+            "objectivity": _clamp(
+                9 - sensational_rate * 8 - exclamation_ratio * 10 - hedge_rate
+            ),
+            "transparency": _clamp(
+                2
+                + (3 if has_author else 0)
+                + (3 if has_date else 0)
+                + min(attribution_rate, 2)
+            ),
+        }
+
+        score_values = [domain_score, *scores.values()]
+        overall_score = int((sum(score_values) / len(score_values)) * 10)
+
+        if sensational_rate >= 0.4 or exclamation_ratio >= 0.2:
+            sensationalism = "high"
+        elif sensational_rate >= 0.15 or exclamation_ratio >= 0.05:
+            sensationalism = "medium"
+        else:
+            sensationalism = "low"
+
+        concerns: List[str] = []
+        strengths: List[str] = []
+        if rating is None:
+            concerns.append("Source is not in the reputation database")
+        elif rating.score >= 8:
+            strengths.append("Well-established source")
+        if not has_author:
+            concerns.append("No author attribution")
+        if not has_date:
+            concerns.append("No publication date")
+        if sensationalism != "low":
+            concerns.append("Sensational language")
+        if hedge_rate >= 1:
+            concerns.append("Relies on unconfirmed or hedged claims")
+        if scores["evidence_quality"] >= 6:
+            strengths.append("Frequent attribution to sources")
+        elif scores["evidence_quality"] <= 3:
+            concerns.append("Few attributed sources")
+
+        return {
+            "overall_score": overall_score,
+            "domain": domain,
+            "domain_reputation": reputation_label(domain_score),
+            "source_bias": (
+                rating.bias if rating is not None and rating.bias else "unknown"
+            ),
+            "detailed_scores": scores,
+            "bias": "unknown",
+            "sensationalism": sensationalism,
+            "concerns": concerns,
+            "strengths": strengths,
+            "analysis_source": "heuristic",
+            "rated_source": rating is not None,
+        }
+
+    def is_confident(self, result: Dict) -> bool:
+        if not result.get("rated_source"):
+            return False
+        score = result.get("overall_score", 50)
+        return score >= AUTO_TIER_HIGH_SCORE or score <= AUTO_TIER_LOW_SCORE
+
+    def fact_check_result(self, result: Dict) -> Dict:
+        tactics = []
+        if result.get("sensationalism") in ("medium", "high"):
+            tactics.append("Emotional Language")
+        return {"claims": [], "manipulation_tactics": tactics}
@@ -0,0 +1,51 @@
+from typing import List, Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+MAX_CLAIMS = 5
+
+
+class CredibilityScores(BaseModel):
+    source_reputation: int = Field(ge=0, le=10)
+    writing_quality: int = Field(ge=0, le=10)
+    evidence_quality: int = Field(ge=0, le=10)
+    objectivity: int = Field(ge=0, le=10)
+    transparency: int = Field(ge=0, le=10)
+
+
+class CredibilityAnalysis(BaseModel):
+    scores: CredibilityScores
+    bias: Literal["left", "center", "right", "neutral"]
+    sensationalism: Literal["low", "medium", "high"]
+    concerns: List[str]
+    strengths: List[str]
+
+
+class Claim(BaseModel):
+    claim: str
+    verifiability: Literal["Verifiable", "Partially Verifiable", "Difficult to Verify"]
+    reasoning: str
+
+
+class FactCheckAnalysis(BaseModel):
+    claims: List[Claim]
+    manipulation_tactics: List[str]
+
+    # The prompt asks for up to 5 claims; extra ones are dropped rather than
+    # failing validation and spending a retry.
+    @field_validator("claims")
+    @classmethod
+    def keep_top_claims(cls, claims: List[Claim]) -> List[Claim]:
+        return claims[:MAX_CLAIMS]
+
+
+class CombinedAnalysis(BaseModel):
+    credibility: CredibilityAnalysis
+    fact_checks: FactCheckAnalysis
+
+
+class NeutralSummary(BaseModel):
+    consensus_summary: str
+    points_of_agreement: List[str]
+    points_of_disagreement: List[str]
+    media_literacy_tip: str
@@ -1,6 +1,15 @@
+import os
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Dict, List, Optional
 
+from utils.concurrency import run_blocking, BLOCKING_IO_WORKERS
+from utils.metrics import UPSTREAM_DURATION, UPSTREAM_ERRORS, UPSTREAM_IN_FLIGHT
+from utils.rate_limiter import get_limiter
+from utils.tracing import span
+
+NEWSAPI_BASE_URL = os.getenv("NEWSAPI_BASE_URL", "https://newsapi.org/v2")
+
 
 class NewsSearcher:
     def __init__(self, api_key: str):
@@ -8,7 +17,19 @@ class NewsSearcher:
             raise ValueError("NEWSAPI_KEY is required")
 
         self.api_key = api_key
-        self.base_url = "https://newsapi.org/v2"
+        self.base_url = NEWSAPI_BASE_URL.rstrip("/")
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=BLOCKING_IO_WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.rate_limiter = get_limiter("NEWSAPI")
+
+    async def warm_up(self, timeout: float) -> None:
+        await run_blocking(self.session.head, self.base_url, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
 
     async def search_multiple_sources(
         self, query: str, sources: Optional[List[str]] = None
@@ -27,10 +48,29 @@ class NewsSearcher:
             if sources:
                 params["domains"] = ",".join(sources)
 
-            response = requests.get(endpoint, params=params, timeout=10)
-            data = response.json()
+            with span("newsapi.everything", query_chars=len(query)) as request_span:
+                async with self.rate_limiter.acquire():
+                    with UPSTREAM_IN_FLIGHT.track_inprogress(
+                        upstream="newsapi"
+                    ), UPSTREAM_DURATION.time(
+                        upstream="newsapi", operation="everything"
+                    ):
+                        response = await run_blocking(
+                            self.session.get, endpoint, params=params, timeout=10
+                        )
+                data = response.json()
+                request_span.set_attributes(
+                    status_code=response.status_code,
+                    response_bytes=len(response.content),
+                    articles=len(data.get("articles", [])),
+                )
 
             if data.get("status") != "ok":
+                UPSTREAM_ERRORS.inc(
+                    upstream="newsapi",
+                    operation="everything",
+                    reason=str(data.get("code", "api_error")),
+                )
                 raise Exception(
                     f"NewsAPI error: {data.get('message', 'Unknown error')}"
                 )
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from utils.concurrency import run_blocking
+
+
+class LRUCache:
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 3600,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, size, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any, size: int, ttl: Optional[float] = None) -> None:
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class SQLiteStore:
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 86400,
+        table: str = "cache",
+        max_entries: int = 0,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.table = table
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_expires_at ON {table} (expires_at)"
+        )
+        self._conn.commit()
+        self.hits = 0
+        self.misses = 0
+        self.pruned = 0
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_with_ttl(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_ttl(self, key: str) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+
+            remaining = row[1] - time.time() if row is not None else 0
+            if remaining <= 0:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            return row[0], remaining
+
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) "
+                "VALUES (?, ?, ?)",
+                (key, value, time.time() + self.ttl),
+            )
+            self._conn.commit()
+
+    def prune(self) -> int:
+        with self._lock:
+            removed = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),)
+            ).rowcount
+            if self.max_entries:
+                # Every entry gets the same TTL, so the soonest to expire are the
+                # oldest writes.
+                removed += self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY expires_at DESC "
+                    "LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+            self._conn.commit()
+            self.pruned += removed
+            return removed
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute(
+                f"SELECT COUNT(*) FROM {self.table}"
+            ).fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "path": self.path,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "pruned": self.pruned,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class TieredCache:
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteStore] = None):
+        self.memory = memory
+        self.disk = disk
+
+    # Both tiers hold the JSON text, so every hit decodes a fresh copy that
+    # callers are free to mutate.
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.memory.get(key)
+        if raw is None and self.disk is not None:
+            entry = self.disk.get_with_ttl(key)
+            if entry is not None:
+                raw, remaining = entry
+                self.memory.set(key, raw, len(raw), ttl=min(remaining, self.memory.ttl))
+        return json.loads(raw) if raw is not None else None
+
+    # For callers on the event loop: the SQLite tier is queried in a worker
+    # thread, memory hits are served inline.
+    async def get_async(self, key: str) -> Optional[Any]:
+        if self.disk is None:
+            return self.get(key)
+
+        raw = self.memory.get(key)
+        if raw is None:
+            entry = await run_blocking(self.disk.get_with_ttl, key)
+            if entry is not None:
+                raw, remaining = entry
+                self.memory.set(key, raw, len(raw), ttl=min(remaining, self.memory.ttl))
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any) -> None:
+        self.set_raw(key, json.dumps(value, default=str))
+
+    def set_raw(self, key: str, raw: str) -> None:
+        self.memory.set(key, raw, len(raw))
+        if self.disk is not None:
+            self.disk.set(key, raw)
+
+    async def set_raw_async(self, key: str, raw: str) -> None:
+        self.memory.set(key, raw, len(raw))
+        if self.disk is not None:
+            await run_blocking(self.disk.set, key, raw)
+
+    def prune(self) -> int:
+        return self.disk.prune() if self.disk is not None else 0
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {"memory": self.memory.stats()}
+        if self.disk is not None:
+            stats["disk"] = self.disk.stats()
+        return stats
+
+
+class LLMResponseCache:
+    def __init__(self, cache: TieredCache, max_entry_bytes: int = 64 * 1024):
+        self.cache = cache
+        self.max_entry_bytes = max_entry_bytes
+        self.oversized = 0
+
+    @staticmethod
+    def make_key(model_name: str, prompt: str) -> str:
+        normalized = re.sub(r"\s+", " ", prompt).strip()
+        digest = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+        return f"{model_name}:{digest}"
+
+    def get(self, model_name: str, prompt: str) -> Optional[Dict]:
+        return self.cache.get(self.make_key(model_name, prompt))
+
+    async def get_async(self, model_name: str, prompt: str) -> Optional[Dict]:
+        return await self.cache.get_async(self.make_key(model_name, prompt))
+
+    def set(self, model_name: str, prompt: str, value: Dict) -> None:
+        raw = self._encode(value)
+        if raw is not None:
+            self.cache.set_raw(self.make_key(model_name, prompt), raw)
+
+    async def set_async(self, model_name: str, prompt: str, value: Dict) -> None:
+        raw = self._encode(value)
+        if raw is not None:
+            await self.cache.set_raw_async(self.make_key(model_name, prompt), raw)
+
+    def _encode(self, value: Dict) -> Optional[str]:
+        if not isinstance(value, dict):
+            return None
+        raw = json.dumps(value, default=str)
+        if len(raw) > self.max_entry_bytes:
+            self.oversized += 1
+            return None
+        return raw
+
+    def prune(self) -> int:
+        return self.cache.prune()
+
+    def close(self) -> None:
+        self.cache.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.cache.stats(), "oversized_skipped": self.oversized}
+
+
+def cache_from_env(prefix: str, default_ttl: float = 3600) -> TieredCache:
+    ttl = float(os.getenv(f"{prefix}_CACHE_TTL", str(default_ttl)))
+    memory = LRUCache(
+        max_entries=int(os.getenv(f"{prefix}_CACHE_MAX_ENTRIES", "1024")),
+        max_bytes=int(float(os.getenv(f"{prefix}_CACHE_MAX_MB", "64")) * 1024 * 1024),
+        ttl=ttl,
+    )
+
+    disk = None
+    db_path = os.getenv(f"{prefix}_CACHE_DB")
+    if db_path:
+        disk = SQLiteStore(
+            db_path,
+            ttl=ttl,
+            table=prefix.lower() + "_cache",
+            max_entries=int(os.getenv(f"{prefix}_CACHE_DB_MAX_ENTRIES", "100000")),
+        )
+
+    return TieredCache(memory, disk)
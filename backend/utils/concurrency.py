@@ -0,0 +1,25 @@
+import asyncio
+import contextvars
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from utils.profiling import active_sampler, sampled_call
+
+BLOCKING_IO_WORKERS = int(os.getenv("BLOCKING_IO_WORKERS", "32"))
+
+_executor = ThreadPoolExecutor(
+    max_workers=BLOCKING_IO_WORKERS, thread_name_prefix="blocking-io"
+)
+
+
+async def run_blocking(func: Callable, *args, **kwargs) -> Any:
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    sampler = active_sampler()
+    if sampler is not None:
+        func = functools.partial(sampled_call, sampler, func)
+    return await loop.run_in_executor(
+        _executor, functools.partial(context.run, func, *args, **kwargs)
+    )
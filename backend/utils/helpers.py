@@ -1,6 +1,25 @@
 from typing import Dict, Any
+import json
 import re
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qsl, urlencode, urlunparse
+
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "dclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "igshid",
+    "ocid",
+    "cmpid",
+    "ref",
+    "ref_src",
+    "smid",
+    "_ga",
+    "amp",
+    "outputtype",
+}
 
 
 def extract_domain(url: str) -> str:
@@ -14,6 +33,34 @@ def extract_domain(url: str) -> str:
         return "unknown"
 
 
+def canonicalize_url(url: str) -> str:
+    parsed = urlparse(url.strip())
+
+    host = (parsed.hostname or "").lower()
+    for prefix in ("www.", "amp."):
+        if host.startswith(prefix):
+            host = host[len(prefix) :]
+    if parsed.port and parsed.port not in (80, 443):
+        host = f"{host}:{parsed.port}"
+
+    path = re.sub(r"/+", "/", parsed.path or "/")
+    path = re.sub(r"(/amp)+/?$", "", path)
+    path = re.sub(r"/amp/", "/", path)
+    path = re.sub(r"\.amp(\.html?)?$", r"\1", path)
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+
+    return urlunparse(
+        (parsed.scheme.lower() or "https", host, path or "/", "", urlencode(query), "")
+    )
+
+
 def clean_text(text: str) -> str:
     text = re.sub(r"\s+", " ", text)
     text = re.sub(r"[^\w\s.,!?-]", "", text)
@@ -35,3 +82,7 @@ def format_score(score: int) -> Dict[str, Any]:
         return {"score": score, "label": "Low Credibility", "color": "orange"}
     else:
         return {"score": score, "label": "Very Low Credibility", "color": "red"}
+
+
+def format_sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
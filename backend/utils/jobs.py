@@ -0,0 +1,144 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from utils.cache import LRUCache, SQLiteStore
+from utils.concurrency import run_blocking
+from utils.tracing import current_trace_id, new_trace_id, tracer
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queue: int = 100,
+        result_ttl: float = 3600,
+        max_results: int = 10000,
+        store: Optional[SQLiteStore] = None,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.jobs = LRUCache(
+            max_entries=max_results, max_bytes=256 * 1024 * 1024, ttl=result_ttl
+        )
+        # Jobs run in the process that accepted them; the shared store lets
+        # other workers and replicas report their status.
+        self.store = store
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+
+        while self._queue is not None and not self._queue.empty():
+            job, _ = self._queue.get_nowait()
+            job["status"] = "failed"
+            job["error"] = "Server shut down before the job started"
+            job["finished_at"] = time.time()
+            await self._save(job)
+
+    async def submit(self, job_type: str, run: Callable[[], Awaitable[Any]]) -> Dict:
+        if self._queue is None:
+            raise RuntimeError("JobManager has not been started")
+        if self._queue.full():
+            raise JobQueueFull("Job queue is full, please retry later")
+
+        # Jobs run after the submitting request has finished, so they are traced
+        # under their own root span that reuses the request's trace id.
+        trace_id = current_trace_id()
+        if trace_id is None and tracer.enabled:
+            trace_id = new_trace_id()
+
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "type": job_type,
+            "status": "queued",
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "result": None,
+            "error": None,
+            "trace_id": trace_id,
+        }
+
+        # Stored before it is queued, so a worker's "running" update cannot be
+        # overwritten by this one.
+        await self._save(job)
+        try:
+            self._queue.put_nowait((job, run))
+        except asyncio.QueueFull:
+            job["status"] = "failed"
+            job["error"] = "Job queue is full, please retry later"
+            await self._save(job)
+            raise JobQueueFull(job["error"])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict]:
+        job = self.jobs.get(job_id)
+        if job is None and self.store is not None:
+            raw = await run_blocking(self.store.get, job_id)
+            if raw is not None:
+                job = json.loads(raw)
+        return job
+
+    def prune(self) -> int:
+        return self.store.prune() if self.store is not None else 0
+
+    async def _save(self, job: Dict) -> None:
+        raw = json.dumps(job, default=str)
+        self.jobs.set(job["job_id"], job, len(raw))
+        if self.store is not None:
+            try:
+                await run_blocking(self.store.set, job["job_id"], raw)
+            except Exception as e:
+                print(f"Failed to store job {job['job_id']}: {str(e)}")
+
+    async def _worker(self) -> None:
+        while True:
+            job, run = await self._queue.get()
+            job["status"] = "running"
+            job["started_at"] = time.time()
+            await self._save(job)
+            with tracer.root_span(
+                f"job.{job['type']}",
+                trace_id=job["trace_id"],
+                **{"job.id": job["job_id"], "job.type": job["type"]},
+            ) as job_span:
+                try:
+                    job["result"] = await run()
+                    job["status"] = "completed"
+                except asyncio.CancelledError:
+                    job["status"] = "failed"
+                    job["error"] = "Job was cancelled"
+                    raise
+                except Exception as e:
+                    job["status"] = "failed"
+                    job["error"] = str(getattr(e, "detail", e))
+                finally:
+                    job_span.set_attribute("job.status", job["status"])
+                    job["finished_at"] = time.time()
+                    await self._save(job)
+                    self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._worker_tasks),
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "stored_jobs": self.jobs.stats()["entries"],
+        }
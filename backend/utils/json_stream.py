@@ -0,0 +1,63 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class JSONFieldStream:
+    def __init__(self):
+        self.buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._key_start: Optional[int] = None
+        self._key: Optional[str] = None
+        self._value_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self.buffer += chunk
+        fields = []
+
+        while self._position < len(self.buffer):
+            char = self.buffer[self._position]
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._key_start is not None:
+                        self._key = json.loads(
+                            self.buffer[self._key_start : self._position + 1]
+                        )
+                        self._key_start = None
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._value_start is None:
+                    self._key_start = self._position
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_field(fields)
+            elif self._depth == 1:
+                if char == ":" and self._value_start is None:
+                    self._value_start = self._position + 1
+                elif char == ",":
+                    self._complete_field(fields)
+
+            self._position += 1
+
+        return fields
+
+    def _complete_field(self, fields: List[Tuple[str, Any]]) -> None:
+        if self._key is not None and self._value_start is not None:
+            raw_value = self.buffer[self._value_start : self._position]
+            try:
+                fields.append((self._key, json.loads(raw_value)))
+            except json.JSONDecodeError:
+                pass
+        self._key = None
+        self._value_start = None
@@ -0,0 +1,227 @@
+import contextvars
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Set
+from urllib.parse import parse_qs
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "1"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN", "")
+PROFILE_KEEP = int(os.getenv("PROFILE_KEEP", "50"))
+
+PROFILED_PATHS = ("/api/verify", "/api/search")
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{16}$")
+
+# Leaf frames that mean the event loop is waiting, not working. uvloop waits in
+# C, so its innermost Python frame is the call that started the loop.
+IDLE_FRAMES = {
+    ("selectors.py", "select"),
+    ("asyncio/runners.py", "run"),
+    ("uvloop/__init__.py", "run"),
+}
+
+_active_sampler: contextvars.ContextVar[Optional["StackSampler"]] = (
+    contextvars.ContextVar("active_sampler", default=None)
+)
+_session_lock = threading.Lock()
+# Ids already sent to clients whose profile is not written yet; the file only
+# appears once the whole response has been sent.
+_pending_profiles: Set[str] = set()
+
+
+class StackSampler:
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.idle_samples = 0
+        self._threads: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.started = 0.0
+        self.duration = 0.0
+
+    def add_thread(self, ident: int) -> None:
+        with self._lock:
+            self._threads[ident] = self._threads.get(ident, 0) + 1
+
+    def remove_thread(self, ident: int) -> None:
+        with self._lock:
+            remaining = self._threads.get(ident, 0) - 1
+            if remaining > 0:
+                self._threads[ident] = remaining
+            else:
+                self._threads.pop(ident, None)
+
+    def start(self) -> None:
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(
+            target=self._run, name="profile-sampler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.duration = time.perf_counter() - self.started
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            with self._lock:
+                idents = list(self._threads)
+            frames = sys._current_frames()
+            for ident in idents:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self._sample(frame)
+
+    def _sample(self, frame) -> None:
+        code = frame.f_code
+        self.samples += 1
+        if _is_idle(code):
+            self.idle_samples += 1
+            return
+
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+
+def _is_idle(code) -> bool:
+    filename = code.co_filename.replace(os.sep, "/")
+    return any(
+        code.co_name == name and filename.endswith(f"/{path}")
+        for path, name in IDLE_FRAMES
+    )
+
+
+def active_sampler() -> Optional[StackSampler]:
+    return _active_sampler.get()
+
+
+def sampled_call(sampler: StackSampler, func: Callable, *args, **kwargs) -> Any:
+    ident = threading.get_ident()
+    sampler.add_thread(ident)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        sampler.remove_thread(ident)
+
+
+def profile_pending(profile_id: str) -> bool:
+    return profile_id in _pending_profiles
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    if not PROFILE_ID_PATTERN.match(profile_id):
+        return None
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+    return path if os.path.exists(path) else None
+
+
+def _save_profile(profile_id: str, sampler: StackSampler) -> str:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    path = os.path.join(PROFILE_DIR, f"{profile_id}.folded")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(sampler.folded())
+
+    profiles: List[str] = sorted(
+        (
+            os.path.join(PROFILE_DIR, name)
+            for name in os.listdir(PROFILE_DIR)
+            if name.endswith(".folded")
+        ),
+        key=os.path.getmtime,
+    )
+    for stale in profiles[:-PROFILE_KEEP]:
+        os.remove(stale)
+    return path
+
+
+def _profile_requested(scope) -> bool:
+    if not scope["path"].startswith(PROFILED_PATHS):
+        return False
+
+    value = ""
+    for key, header_value in scope.get("headers", []):
+        if key.decode("latin-1") == PROFILE_HEADER:
+            value = header_value.decode("latin-1")
+    if not value:
+        query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        value = query.get("profile", [""])[0]
+
+    if PROFILE_TOKEN:
+        return secrets.compare_digest(value, PROFILE_TOKEN)
+    return value.lower() in ("1", "true")
+
+
+class ProfilingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            not PROFILING_ENABLED
+            or scope["type"] != "http"
+            or not _profile_requested(scope)
+            or random.random() >= PROFILE_SAMPLE_RATE
+            or not _session_lock.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = secrets.token_hex(8)
+        _pending_profiles.add(profile_id)
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        sampler = StackSampler()
+        sampler.add_thread(threading.get_ident())
+        token = _active_sampler.set(sampler)
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _active_sampler.reset(token)
+            sampler.stop()
+            _session_lock.release()
+            # Imported here because utils.concurrency imports this module.
+            from utils.concurrency import run_blocking
+
+            try:
+                path = await run_blocking(_save_profile, profile_id, sampler)
+                print(
+                    f"Profiled {scope['method']} {scope['path']} in "
+                    f"{sampler.duration * 1000:.0f} ms: {sampler.samples} samples "
+                    f"({sampler.idle_samples} idle), saved to {path}"
+                )
+            except OSError as e:
+                print(f"Failed to save profile {profile_id}: {str(e)}")
+            finally:
+                _pending_profiles.discard(profile_id)
@@ -0,0 +1,168 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+
+class RateLimiterSaturated(Exception):
+    pass
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.available = per_minute
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.available = min(
+            self.capacity, self.available + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def delay_for(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.rate
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_concurrent: Optional[int] = None,
+        max_queue: Optional[int] = None,
+    ):
+        self.name = name
+        self.requests = (
+            TokenBucket(requests_per_minute) if requests_per_minute else None
+        )
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        # Created on first use so they bind to the running loop (Python < 3.10
+        # binds asyncio primitives to the loop current at construction).
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._turn: Optional[asyncio.Lock] = None
+        self.waiting = 0
+        self.in_flight = 0
+        self.acquired = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @asynccontextmanager
+    async def acquire(self, tokens: int = 0) -> AsyncIterator[None]:
+        if self.max_queue and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise RateLimiterSaturated(
+                f"{self.name} rate limiter queue is full ({self.waiting} waiting)"
+            )
+
+        if self._turn is None:
+            # asyncio.Lock wakes waiters in arrival order, which keeps the queue fair.
+            self._turn = asyncio.Lock()
+            if self.max_concurrent:
+                self._slots = asyncio.Semaphore(self.max_concurrent)
+
+        started_at = time.monotonic()
+        self.waiting += 1
+        holding_slot = False
+        try:
+            async with self._turn:
+                if self._slots is not None:
+                    await self._slots.acquire()
+                    holding_slot = True
+                await self._wait_for_budget(tokens)
+        except BaseException:
+            if holding_slot:
+                self._slots.release()
+            raise
+        finally:
+            self.waiting -= 1
+
+        waited = time.monotonic() - started_at
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            if self._slots is not None:
+                self._slots.release()
+
+    async def _wait_for_budget(self, tokens: int) -> None:
+        while True:
+            delay = 0.0
+            if self.requests is not None:
+                delay = max(delay, self.requests.delay_for(1))
+            if self.tokens is not None and tokens:
+                delay = max(delay, self.tokens.delay_for(tokens))
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        if self.requests is not None:
+            self.requests.consume(1)
+        if self.tokens is not None and tokens:
+            self.tokens.consume(tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.waiting,
+            "in_flight": self.in_flight,
+            "acquired": self.acquired,
+            "rejected": self.rejected,
+            "avg_wait_seconds": (
+                round(self.total_wait / self.acquired, 4) if self.acquired else 0.0
+            ),
+            "max_wait_seconds": round(self.max_wait, 4),
+            "requests_per_minute": self.requests.capacity if self.requests else None,
+            "tokens_per_minute": self.tokens.capacity if self.tokens else None,
+            "max_concurrent": self.max_concurrent,
+        }
+
+
+_limiters: Dict[str, RateLimiter] = {}
+
+
+def _env_number(name: str) -> Optional[float]:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def get_limiter(name: str) -> RateLimiter:
+    name = name.upper()
+    if name not in _limiters:
+        max_concurrent = _env_number(f"{name}_MAX_CONCURRENT")
+        max_queue = _env_number(f"{name}_MAX_QUEUE")
+        _limiters[name] = RateLimiter(
+            name,
+            requests_per_minute=_env_number(f"{name}_RPM"),
+            tokens_per_minute=_env_number(f"{name}_TPM"),
+            max_concurrent=int(max_concurrent) if max_concurrent else None,
+            max_queue=int(max_queue) if max_queue else None,
+        )
+    return _limiters[name]
+
+
+def limiter_stats() -> Dict[str, Dict[str, Any]]:
+    return {name.lower(): limiter.stats() for name, limiter in _limiters.items()}
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
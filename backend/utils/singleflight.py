@@ -0,0 +1,102 @@
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+
+class _Broadcast:
+    def __init__(self):
+        self.events: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.task: Optional[asyncio.Task] = None
+        self._changed = asyncio.Event()
+
+    def publish(self, event: Any) -> None:
+        self.events.append(event)
+        self._wake()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._wake()
+
+    def _wake(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        # Late subscribers replay the events published so far, then follow along.
+        index = 0
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self.executed = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, run: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._inflight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done))
+            self.executed += 1
+
+        # Shielded so one caller disconnecting doesn't cancel the shared work.
+        return await asyncio.shield(task)
+
+    async def stream(
+        self, key: str, run: Callable[[], AsyncIterator[Any]]
+    ) -> AsyncIterator[Any]:
+        broadcast = self._streams.get(key)
+        if broadcast is not None:
+            self.coalesced += 1
+        else:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+            # A task of its own, so one subscriber disconnecting doesn't stop
+            # the stream for the others.
+            broadcast.task = asyncio.ensure_future(self._pump(key, broadcast, run))
+            self.executed += 1
+
+        async for event in broadcast.subscribe():
+            yield event
+
+    async def _pump(
+        self, key: str, broadcast: _Broadcast, run: Callable[[], AsyncIterator[Any]]
+    ) -> None:
+        error = None
+        try:
+            async for event in run():
+                broadcast.publish(event)
+        except Exception as e:
+            error = e
+        finally:
+            if self._streams.get(key) is broadcast:
+                del self._streams[key]
+            broadcast.finish(error)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._inflight) + len(self._streams),
+            "executed": self.executed,
+            "coalesced": self.coalesced,
+        }
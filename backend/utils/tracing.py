@@ -0,0 +1,334 @@
+import contextvars
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+import requests
+
+TRACE_HEADER = "x-trace-id"
+TRACE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+TRACEPARENT_PATTERN = re.compile(
+    r"^[0-9a-f]{2}-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$"
+)
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def new_trace_id() -> str:
+    return secrets.token_hex(16)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current_span.get()
+    return current.trace_id if current is not None else None
+
+
+class Span:
+    def __init__(
+        self,
+        name: str,
+        trace_id: str,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = dict(attributes or {})
+        self.start_time = time.time()
+        self.end_time: Optional[float] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, **attributes: Any) -> None:
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_ms": round(
+                ((self.end_time or time.time()) - self.start_time) * 1000, 3
+            ),
+            "attributes": self.attributes,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+class _NoopSpan:
+    trace_id = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, **attributes: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class JSONLExporter:
+    def __init__(self, path: str):
+        self.path = path
+
+    def export(self, spans: List[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+
+class OTLPHTTPExporter:
+    def __init__(self, endpoint: str, service_name: str = "validata-backend"):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.session = requests.Session()
+
+    def export(self, spans: List[Span]) -> None:
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            _otlp_attribute("service.name", self.service_name)
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "validata"},
+                            "spans": [_otlp_span(span) for span in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+        self.session.post(self.endpoint, json=payload, timeout=5)
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+def _otlp_span(span: Span) -> Dict[str, Any]:
+    otlp_span = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": 1,
+        "startTimeUnixNano": str(int(span.start_time * 1e9)),
+        "endTimeUnixNano": str(int((span.end_time or span.start_time) * 1e9)),
+        "attributes": [
+            _otlp_attribute(key, value) for key, value in span.attributes.items()
+        ],
+        "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+    }
+    if span.parent_id:
+        otlp_span["parentSpanId"] = span.parent_id
+    return otlp_span
+
+
+class Tracer:
+    def __init__(
+        self,
+        exporter=None,
+        flush_interval: float = 2.0,
+        max_batch: int = 512,
+        max_buffer: int = 10000,
+    ):
+        self.exporter = exporter
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self.max_buffer = max_buffer
+        self.dropped = 0
+        self._buffer: List[Span] = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def start(self) -> None:
+        if not self.enabled or self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="trace-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=10)
+        self._thread = None
+        self.flush()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            if len(self._buffer) >= self.max_buffer:
+                self.dropped += 1
+                return
+            self._buffer.append(span)
+            if len(self._buffer) >= self.max_batch:
+                self._wakeup.set()
+
+    def flush(self) -> None:
+        while True:
+            with self._lock:
+                batch = self._buffer[: self.max_batch]
+                del self._buffer[: self.max_batch]
+            if not batch:
+                return
+            try:
+                self.exporter.export(batch)
+            except Exception as e:
+                print(f"Trace export failed: {str(e)}")
+                return
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    def start_span(self, name: str, **attributes: Any) -> Any:
+        parent = _current_span.get()
+        if not self.enabled or parent is None:
+            return NOOP_SPAN
+        return Span(name, parent.trace_id, parent.span_id, attributes)
+
+    def end_span(self, current: Any, error: Optional[BaseException] = None) -> None:
+        if current is NOOP_SPAN:
+            return
+        if error is not None:
+            current.error = f"{type(error).__name__}: {str(error)}"
+        current.end_time = time.time()
+        self.record(current)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Any]:
+        with self._activate(self.start_span(name, **attributes)) as current:
+            yield current
+
+    @contextmanager
+    def root_span(
+        self, name: str, trace_id: Optional[str] = None, **attributes: Any
+    ) -> Iterator[Any]:
+        current = NOOP_SPAN
+        if self.enabled:
+            current = Span(name, trace_id or new_trace_id(), None, attributes)
+        with self._activate(current) as current:
+            yield current
+
+    @contextmanager
+    def _activate(self, current: Any) -> Iterator[Any]:
+        if current is NOOP_SPAN:
+            yield current
+            return
+
+        token = _current_span.set(current)
+        try:
+            yield current
+        except BaseException as e:
+            self.end_span(current, e)
+            raise
+        else:
+            self.end_span(current)
+        finally:
+            _current_span.reset(token)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buffered = len(self._buffer)
+        return {
+            "enabled": self.enabled,
+            "exporter": type(self.exporter).__name__ if self.exporter else None,
+            "buffered": buffered,
+            "dropped": self.dropped,
+        }
+
+
+def exporter_from_env():
+    exporter = os.getenv("TRACE_EXPORTER", "").lower()
+    if exporter == "jsonl":
+        return JSONLExporter(os.getenv("TRACE_FILE", "traces.jsonl"))
+    if exporter == "otlp":
+        return OTLPHTTPExporter(
+            os.getenv("TRACE_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+        )
+    return None
+
+
+tracer = Tracer(exporter_from_env())
+span = tracer.span
+
+
+def trace_id_from_headers(headers: Dict[str, str]) -> Optional[str]:
+    trace_id = headers.get(TRACE_HEADER, "").strip().lower().replace("-", "")
+    if TRACE_ID_PATTERN.match(trace_id):
+        return trace_id
+
+    match = TRACEPARENT_PATTERN.match(headers.get("traceparent", "").strip().lower())
+    return match.group(1) if match else None
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope.get("headers", [])
+        }
+        trace_id = trace_id_from_headers(headers) or new_trace_id()
+
+        async def send_with_trace_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (b"x-trace-id", trace_id.encode("latin-1"))
+                ]
+                request_span.set_attribute("http.status_code", message["status"])
+            await send(message)
+
+        with tracer.root_span(
+            f"{scope['method']} {scope['path']}",
+            trace_id=trace_id,
+            **{"http.method": scope["method"], "http.path": scope["path"]},
+        ) as request_span:
+            await self.app(scope, receive, send_with_trace_id)
+            route = scope.get("route")
+            if route is not None:
+                request_span.set_attribute("http.route", route.path)
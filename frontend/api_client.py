@@ -1,15 +1,57 @@
 import requests
 import os
 from dotenv import load_dotenv
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, Tuple
 import json
+import uuid
 
 load_dotenv()
 
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
 
+def _trace_headers(trace_id: str) -> Dict[str, str]:
+    return {"X-Trace-Id": trace_id}
+
+
+# Failures and stream completions carry the trace id sent to the backend, so the
+# UI can show the id to look a failed or partial request up by.
+def _with_trace_id(result: Dict[str, Any], trace_id: str) -> Dict[str, Any]:
+    if not result.get("success"):
+        result.setdefault("trace_id", trace_id)
+    return result
+
+
+def _events_with_trace_id(
+    events: Iterator[Tuple[str, Dict[str, Any]]], trace_id: str
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for event, payload in events:
+        if event in ("error", "complete"):
+            payload.setdefault("trace_id", trace_id)
+        yield event, payload
+
+
 def verify_article(url: str) -> Dict[str, Any]:
+    trace_id = uuid.uuid4().hex
+    return _with_trace_id(_verify_article(url, trace_id), trace_id)
+
+
+def verify_article_stream(url: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    trace_id = uuid.uuid4().hex
+    return _events_with_trace_id(_verify_article_stream(url, trace_id), trace_id)
+
+
+def search_news(query: str) -> Dict[str, Any]:
+    trace_id = uuid.uuid4().hex
+    return _with_trace_id(_search_news(query, trace_id), trace_id)
+
+
+def search_news_stream(query: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    trace_id = uuid.uuid4().hex
+    return _events_with_trace_id(_search_news_stream(query, trace_id), trace_id)
+
+
+def _verify_article(url: str, trace_id: str) -> Dict[str, Any]:
     try:
         if not url or not isinstance(url, str):
             return {"success": False, "detail": "Invalid URL provided"}
@@ -25,6 +67,7 @@ def verify_article(url: str) -> Dict[str, Any]:
         response = requests.post(
             f"{BACKEND_URL}/api/verify",
             json={"url": url},
+            headers=_trace_headers(trace_id),
             timeout=120,
         )
 
@@ -98,7 +141,72 @@ def verify_article(url: str) -> Dict[str, Any]:
         return {"success": False, "detail": f"Unexpected error: {str(e)}"}
 
 
-def search_news(query: str) -> Dict[str, Any]:
+def _iter_sse_events(
+    response: requests.Response,
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    event = "message"
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[len("event:") :].strip()
+        elif line.startswith("data:"):
+            yield event, json.loads(line[len("data:") :])
+
+
+def _verify_article_stream(
+    url: str, trace_id: str
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    try:
+        if not url or not isinstance(url, str):
+            yield "error", {"detail": "Invalid URL provided"}
+            return
+
+        url = url.strip()
+
+        if not url.startswith(("http://", "https://")):
+            yield "error", {"detail": "URL must start with http:// or https://"}
+            return
+
+        with requests.post(
+            f"{BACKEND_URL}/api/verify/stream",
+            json={"url": url},
+            headers=_trace_headers(trace_id),
+            stream=True,
+            timeout=(10, 120),
+        ) as response:
+            if response.status_code == 422:
+                yield "error", {"detail": "URL validation failed: Invalid URL format"}
+                return
+            elif response.status_code == 404:
+                yield "error", {
+                    "detail": "API endpoint not found. Please check if the backend server is running correctly."
+                }
+                return
+
+            response.raise_for_status()
+
+            yield from _iter_sse_events(response)
+
+    except requests.exceptions.Timeout:
+        yield "error", {
+            "detail": "Request timed out after 120 seconds. The article may be too large or the server is busy. Please try again.",
+        }
+    except requests.exceptions.ConnectionError:
+        yield "error", {
+            "detail": f"Cannot connect to backend server at {BACKEND_URL}. Please ensure the server is running.",
+        }
+    except requests.exceptions.HTTPError as e:
+        yield "error", {"detail": f"HTTP error occurred: {str(e)}"}
+    except requests.exceptions.RequestException as e:
+        yield "error", {"detail": f"Request error: {str(e)}"}
+    except json.JSONDecodeError:
+        yield "error", {
+            "detail": "Failed to parse server response. The server may have returned invalid data.",
+        }
+    except Exception as e:
+        yield "error", {"detail": f"Unexpected error: {str(e)}"}
+
+
+def _search_news(query: str, trace_id: str) -> Dict[str, Any]:
     try:
         if not query or not isinstance(query, str):
             return {"success": False, "detail": "Invalid search query provided"}
@@ -120,6 +228,7 @@ def search_news(query: str) -> Dict[str, Any]:
         response = requests.post(
             f"{BACKEND_URL}/api/search",
             json={"query": query},
+            headers=_trace_headers(trace_id),
             timeout=120,
         )
 
@@ -196,6 +305,68 @@ def search_news(query: str) -> Dict[str, Any]:
         return {"success": False, "detail": f"Unexpected error: {str(e)}"}
 
 
+def _search_news_stream(
+    query: str, trace_id: str
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    try:
+        if not query or not isinstance(query, str):
+            yield "error", {"detail": "Invalid search query provided"}
+            return
+
+        query = query.strip()
+
+        if len(query) < 3:
+            yield "error", {"detail": "Search query must be at least 3 characters long"}
+            return
+
+        if len(query) > 200:
+            yield "error", {
+                "detail": "Search query is too long (maximum 200 characters)"
+            }
+            return
+
+        with requests.post(
+            f"{BACKEND_URL}/api/search/stream",
+            json={"query": query},
+            headers=_trace_headers(trace_id),
+            stream=True,
+            timeout=(10, 120),
+        ) as response:
+            if response.status_code == 422:
+                yield "error", {
+                    "detail": "Query validation failed: Invalid query format"
+                }
+                return
+            elif response.status_code == 404:
+                yield "error", {
+                    "detail": "API endpoint not found. Please check if the backend server is running correctly."
+                }
+                return
+
+            response.raise_for_status()
+
+            yield from _iter_sse_events(response)
+
+    except requests.exceptions.Timeout:
+        yield "error", {
+            "detail": "Request timed out after 120 seconds. Please try again with a more specific query.",
+        }
+    except requests.exceptions.ConnectionError:
+        yield "error", {
+            "detail": f"Cannot connect to backend server at {BACKEND_URL}. Please ensure the server is running.",
+        }
+    except requests.exceptions.HTTPError as e:
+        yield "error", {"detail": f"HTTP error occurred: {str(e)}"}
+    except requests.exceptions.RequestException as e:
+        yield "error", {"detail": f"Request error: {str(e)}"}
+    except json.JSONDecodeError:
+        yield "error", {
+            "detail": "Failed to parse server response. The server may have returned invalid data.",
+        }
+    except Exception as e:
+        yield "error", {"detail": f"Unexpected error: {str(e)}"}
+
+
 def check_backend_health() -> Dict[str, Any]:
     try:
         response = requests.get(
@@ -1,7 +1,7 @@
 import streamlit as st
 from styles import apply_custom_styles
 from display import display_article_verification, display_news_search_results
-from api_client import verify_article, search_news
+from api_client import verify_article_stream, search_news_stream
 from error_components import (
     show_connection_error,
     show_timeout_error,
@@ -259,12 +259,31 @@ def render_verify_mode():
                         status_text = st.empty()
 
                         status_text.text("⏳ Extracting article content...")
-                        progress_bar.progress(25)
-
-                        data = verify_article(url_input.strip())
 
-                        progress_bar.progress(50)
-                        status_text.text("⏳ Analyzing credibility...")
+                        stage_messages = {
+                            "extraction": "⏳ Article extracted, analyzing...",
+                            "credibility": "⏳ Credibility assessed...",
+                            "claims": "⏳ Claims checked...",
+                            "similar_articles": "⏳ Similar articles found...",
+                        }
+                        data = {}
+                        stages_done = 0
+
+                        for event, payload in verify_article_stream(
+                            url_input.strip()
+                        ):
+                            if event == "error":
+                                data = {"success": False, **payload}
+                                break
+
+                            data.update(payload)
+                            if event == "complete":
+                                break
+
+                            if event in stage_messages:
+                                stages_done += 1
+                                progress_bar.progress(min(stages_done * 25, 100))
+                                status_text.text(stage_messages[event])
 
                         if data.get("success"):
                             status_text.text("✅ Analysis complete!")
@@ -280,6 +299,8 @@ def render_verify_mode():
                                 "Article verification completed successfully!"
                             )
                             display_article_verification(data)
+                            if data.get("partial") and data.get("trace_id"):
+                                st.caption(f"Trace ID: {data['trace_id']}")
                         else:
                             progress_bar.empty()
                             status_text.empty()
@@ -309,6 +330,9 @@ def render_verify_mode():
                                     + "Please try again or contact support if the issue persists.",
                                 )
 
+                            if data.get("trace_id"):
+                                st.caption(f"Trace ID: {data['trace_id']}")
+
                 except Exception as e:
                     show_error(
                         "An unexpected error occurred",
@@ -411,13 +435,32 @@ def render_search_mode():
                         progress_bar = st.progress(0)
                         status_text = st.empty()
 
+                        summary_preview = st.empty()
+
                         status_text.text("⏳ Searching news sources...")
                         progress_bar.progress(25)
 
-                        data = search_news(query_input.strip())
+                        data = {}
+                        for event, payload in search_news_stream(query_input.strip()):
+                            if event == "error":
+                                data = {"success": False, **payload}
+                                break
+
+                            if event == "articles":
+                                data.update(payload)
+                                progress_bar.progress(50)
+                                status_text.text(
+                                    f"⏳ Found {payload.get('total_sources', 0)} articles, generating analysis..."
+                                )
+                            elif event == "summary":
+                                if payload.get("field") == "consensus_summary":
+                                    progress_bar.progress(75)
+                                    summary_preview.info(payload.get("value", ""))
+                            elif event == "complete":
+                                data.update(payload)
+                                break
 
-                        progress_bar.progress(50)
-                        status_text.text("⏳ Generating analysis...")
+                        summary_preview.empty()
 
                         if data.get("success"):
                             status_text.text("✅ Search complete!")
@@ -462,6 +505,9 @@ def render_search_mode():
                                     + "Please try again or contact support if the issue persists.",
                                 )
 
+                            if data.get("trace_id"):
+                                st.caption(f"Trace ID: {data['trace_id']}")
+
                 except Exception as e:
                     show_error(
                         "An unexpected error occurred",